@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ======================================================
+# CUBE AGREGAT COUNTRY x YEAR
+# ======================================================
+# Dimaterialisasi sekali per versi dataset: untuk setiap Country x Year dan
+# setiap indikator disimpan count, sum, min, max (mean = sum / count).
+# Roll-up ke Country saja, Year saja, atau global cukup menggabungkan sel
+# cube, sehingga latensi grafik ringkasan tidak bergantung jumlah baris.
+# Bila CSV hanya bertambah baris di akhir, cube diperbarui dari baris baru saja.
+INDICATOR_COLUMNS = [
+    'Avg Temperature (°C)',
+    'CO2 Emissions (Tons/Capita)',
+    'Sea Level Rise (mm)',
+    'Rainfall (mm)',
+    'Population',
+    'Renewable Energy (%)',
+    'Extreme Weather Events',
+    'Forest Area (%)'
+]
+
+# Cara menggabungkan setiap statistik saat merge / roll-up
+CUBE_AGGREGATES = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+
+# Cache level proses: versi dataset -> cube
+_CUBE_CACHE = OrderedDict()
+_CUBE_CACHE_SIZE = 4
+_CUBE_LOCK = threading.Lock()
+
+
+# ======================================================
+# BUILD / MERGE / ROLL-UP
+# ======================================================
+def build_cube(df, columns=INDICATOR_COLUMNS):
+    # float64 agar sum tidak kehilangan presisi pada kolom float32
+    values = df[columns].astype("float64")
+    grouped = values.groupby(
+        [df["Country"].astype(str).rename("Country"), df["Year"]], sort=True
+    )
+    return {stat: grouped.agg(stat) for stat in CUBE_AGGREGATES}
+
+
+def merge_cubes(cube, other):
+    return {
+        stat: pd.concat([cube[stat], other[stat]])
+        .groupby(level=["Country", "Year"], sort=True)
+        .agg(how)
+        for stat, how in CUBE_AGGREGATES.items()
+    }
+
+
+def rollup(cube, level=None):
+    # level "Country" / "Year" -> DataFrame per level; None -> Series global
+    if level is None:
+        return {stat: cube[stat].agg(how) for stat, how in CUBE_AGGREGATES.items()}
+    return {
+        stat: cube[stat].groupby(level=level, sort=True).agg(how)
+        for stat, how in CUBE_AGGREGATES.items()
+    }
+
+
+def select_countries(cube, countries=None):
+    if countries is None:
+        return cube
+    return {
+        stat: frame[frame.index.get_level_values("Country").isin(countries)]
+        for stat, frame in cube.items()
+    }
+
+
+def cube_mean(cube):
+    return cube["sum"] / cube["count"]
+
+
+# ======================================================
+# CUBE DATASET (INKREMENTAL SAAT APPEND)
+# ======================================================
+def dataset_cube(df, version, base=None):
+    # (df, version, base) harus berasal dari satu snapshot load_dataset();
+    # bila cube versi base masih di cache, hanya baris df[rows:] yang diproses
+    with _CUBE_LOCK:
+        if version in _CUBE_CACHE:
+            _CUBE_CACHE.move_to_end(version)
+            return _CUBE_CACHE[version]
+        previous = None if base is None else _CUBE_CACHE.get(base["hash"])
+
+    if previous is not None:
+        cube = merge_cubes(previous, build_cube(df.iloc[base["rows"]:]))
+    else:
+        cube = build_cube(df)
+
+    with _CUBE_LOCK:
+        _CUBE_CACHE[version] = cube
+        while len(_CUBE_CACHE) > _CUBE_CACHE_SIZE:
+            _CUBE_CACHE.popitem(last=False)
+    return cube
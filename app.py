@@ -1,5 +1,10 @@
+import os
+
 import streamlit as st
 
+from page_state import persist_widget_state
+from warmup import STARTUP_MODES, import_page_modules, start_background_warmup
+
 # ======================================================
 # PAGE CONFIG
 # ======================================================
@@ -44,65 +49,93 @@ with col2:
 st.markdown("---")
 
 # ======================================================
-# TAB NAVIGATION (LANGSUNG TERLIHAT)
-# ======================================================
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-    "📘 Dataset",
-    "📊 Visualisasi",
-    "🤖 Machine Learning",
-    "🧠 Alur Model",
-    "🔮 Prediksi",
-    "📬 Kontak"
-])
-
-# ======================================================
-# TAB 1
+# HALAMAN
 # ======================================================
-with tab1:
+def page_dataset():
     st.subheader("📘 Dataset Perubahan Iklim")
     st.caption("Deskripsi sumber data dan variabel iklim")
     import about_dataset
     about_dataset.about_dataset()
 
-# ======================================================
-# TAB 2
-# ======================================================
-with tab2:
+
+def page_visualisasi():
     st.subheader("📊 Visualisasi Data Iklim")
     st.caption("Eksplorasi pola dan tren indikator iklim")
     import visualisasi
     visualisasi.visualisasi()
 
-# ======================================================
-# TAB 3
-# ======================================================
-with tab3:
+
+def page_machine_learning():
     import machine_learning
     machine_learning.machine_learning2()
 
-# ======================================================
-# TAB 4
-# ======================================================
-with tab4:
+
+def page_alur_model():
     import tahapan_model
     tahapan_model.Tahapan_model()
 
-# ======================================================
-# TAB 5
-# ======================================================
-with tab5:
+
+def page_prediksi():
     import prediksi
     prediksi.app_prediksi_klaster_wilayah()
 
-# ======================================================
-# TAB 6
-# ======================================================
-with tab6:
+
+def page_kontak():
     import countact
     countact.contact_tab()
 
+
+PAGES = {
+    "📘 Dataset": page_dataset,
+    "📊 Visualisasi": page_visualisasi,
+    "🤖 Machine Learning": page_machine_learning,
+    "🧠 Alur Model": page_alur_model,
+    "🔮 Prediksi": page_prediksi,
+    "📬 Kontak": page_kontak,
+}
+
+# ======================================================
+# NAVIGASI
+# ======================================================
+# "lazy" : hanya halaman aktif yang dijalankan setiap rerun (default)
+# "tabs" : perilaku lama, seluruh tab dijalankan setiap rerun
+PAGE_MODE = os.environ.get("DASHBOARD_PAGE_MODE", "lazy")
+
+# Startup (lihat warmup.py): "lazy" (default), "warm", "eager"
+STARTUP_MODE = os.environ.get("DASHBOARD_STARTUP", "lazy")
+
+if STARTUP_MODE not in STARTUP_MODES:
+    st.error(
+        f"❌ DASHBOARD_STARTUP='{STARTUP_MODE}' tidak dikenal "
+        f"(pilihan: {', '.join(STARTUP_MODES)}); memakai mode 'lazy'."
+    )
+    STARTUP_MODE = "lazy"
+
+if STARTUP_MODE == "eager":
+    import_page_modules()
+
+persist_widget_state()
+
+if PAGE_MODE == "tabs":
+    for tab, render_page in zip(st.tabs(list(PAGES)), PAGES.values()):
+        with tab:
+            render_page()
+else:
+    active_page = st.radio(
+        "Navigasi Halaman",
+        list(PAGES),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_page"
+    )
+    PAGES[active_page]()
+
 # ======================================================
 # FOOTER (KECIL & RAPI)
 # ======================================================
 st.markdown("---")
 st.caption("© 2025 Climate Change Analytics Dashboard | Python & Streamlit")
+
+# Setelah seluruh elemen halaman pertama terkirim ke browser
+if STARTUP_MODE == "warm":
+    start_background_warmup()
@@ -0,0 +1,57 @@
+import numpy as np
+from sklearn.neighbors import KDTree
+
+# ======================================================
+# INDEX PENUGASAN OUT-OF-SAMPLE
+# ======================================================
+# Untuk model tanpa predict/centroid (Agglomerative, Spectral, DBSCAN),
+# bundle menyimpan KD-tree atas titik training terskala beserta labelnya.
+# "knn"    : voting k tetangga terdekat berbobot 1/jarak
+# "dbscan" : tetangga inti terdekat; di luar eps ditandai noise (-1)
+DEFAULT_N_NEIGHBORS = 5
+NOISE_LABEL = -1
+
+
+def build_assign_index(model, X_scaled, labels, n_neighbors=DEFAULT_N_NEIGHBORS):
+    labels = np.asarray(labels)
+
+    if hasattr(model, "core_sample_indices_"):
+        core = model.core_sample_indices_
+        return {
+            "method": "dbscan",
+            # Tanpa titik inti seluruh data baru otomatis menjadi noise
+            "tree": KDTree(X_scaled[core]) if len(core) else None,
+            "labels": labels[core],
+            "eps": float(model.eps),
+        }
+
+    return {
+        "method": "knn",
+        "tree": KDTree(X_scaled),
+        "labels": labels,
+        "n_neighbors": min(n_neighbors, len(labels)),
+    }
+
+
+def query_assign_index(index, X_scaled):
+    # Return (label, jarak ke titik referensi terdekat), query O(log n) per baris
+    if index["method"] == "dbscan":
+        if index["tree"] is None:
+            n = len(X_scaled)
+            return np.full(n, NOISE_LABEL), np.full(n, np.inf)
+        dist, ind = index["tree"].query(X_scaled, k=1)
+        dist, ind = dist[:, 0], ind[:, 0]
+        labels = np.where(dist <= index["eps"], index["labels"][ind], NOISE_LABEL)
+        return labels, dist
+
+    dist, ind = index["tree"].query(X_scaled, k=index["n_neighbors"])
+    neighbour_labels = index["labels"][ind]
+
+    # Voting berbobot tervektorisasi: (n_query, k) -> (n_query, n_label)
+    classes, encoded = np.unique(neighbour_labels, return_inverse=True)
+    encoded = encoded.reshape(neighbour_labels.shape)
+    weights = 1.0 / np.maximum(dist, 1e-12)
+    votes = np.zeros((len(X_scaled), len(classes)))
+    np.add.at(votes, (np.arange(len(X_scaled))[:, None], encoded), weights)
+
+    return classes[votes.argmax(axis=1)], dist[:, 0]
@@ -0,0 +1,234 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ======================================================
+# BENCHMARK SKALABILITAS PIPELINE KLASTERING
+# ======================================================
+# Untuk setiap ukuran data sintetis dan setiap tahap (lima algoritma,
+# auto_search_k, tiga metrik evaluasi) dicatat waktu, peak RSS, dan hasil
+# silhouette. Setiap kasus dijalankan di proses baru agar peak RSS terisolasi.
+#
+# Contoh:
+#   python benchmarks/bench_clustering.py --sizes 1000 10000 --out hasil.json
+#   python benchmarks/bench_clustering.py --baseline benchmarks/baseline_clustering.json
+#   python benchmarks/bench_clustering.py --sizes 1000 10000 --save-baseline
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline_clustering.json")
+
+ALGORITHMS = ("KMeans", "Agglomerative", "Gaussian Mixture", "Spectral Clustering", "DBSCAN")
+METRICS = ("silhouette", "davies_bouldin", "calinski_harabasz")
+STAGES = tuple(f"fit:{a}" for a in ALGORITHMS) + ("auto_search_k",) + tuple(
+    f"metric:{m}" for m in METRICS
+)
+LINEAR_METRIC_STAGES = ("metric:davies_bouldin", "metric:calinski_harabasz")
+
+BENCH_K = 4
+BENCH_MAX_K = 6
+
+
+def peak_rss_mb():
+    # Linux melaporkan ru_maxrss dalam KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _prepare(n_rows):
+    from sklearn.preprocessing import StandardScaler
+
+    from synthetic import generate_climate_data
+
+    df = generate_climate_data(n_rows)
+    return StandardScaler().fit_transform(df.select_dtypes("number"))
+
+
+def _fit(algorithm, X):
+    import numpy as np
+    from sklearn.cluster import KMeans
+    from sklearn.mixture import GaussianMixture
+
+    from dbscan_tuning import DEFAULT_EPS, DEFAULT_MIN_SAMPLES, fit_dbscan
+    from scalable_clustering import fit_hierarchical, make_spectral
+
+    if algorithm == "KMeans":
+        return KMeans(n_clusters=BENCH_K, random_state=42).fit_predict(X)
+    if algorithm == "Agglomerative":
+        return fit_hierarchical(X, BENCH_K)[1]
+    if algorithm == "Gaussian Mixture":
+        return GaussianMixture(n_components=BENCH_K, random_state=42).fit_predict(X)
+    if algorithm == "Spectral Clustering":
+        return make_spectral(BENCH_K, len(X))[0].fit_predict(X)
+    return np.asarray(fit_dbscan(X, DEFAULT_EPS, DEFAULT_MIN_SAMPLES)[1])
+
+
+def _run_case(n_rows, stage, queue):
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import calinski_harabasz_score, davies_bouldin_score
+
+    from cluster_metrics import evaluate_silhouette
+    from k_search import auto_search_k
+
+    X = _prepare(n_rows)
+    if stage.startswith("metric:"):
+        labels = KMeans(n_clusters=BENCH_K, random_state=42).fit_predict(X)
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+
+    if stage.startswith("fit:"):
+        labels = _fit(stage[4:], X)
+        value = None
+    elif stage == "auto_search_k":
+        table = auto_search_k(X, BENCH_MAX_K)
+        value = float(table["Silhouette Score"].max())
+    elif stage == "metric:silhouette":
+        result = evaluate_silhouette(X, labels)
+        value = result["score"]
+    elif stage == "metric:davies_bouldin":
+        value = float(davies_bouldin_score(X, labels))
+    else:
+        value = float(calinski_harabasz_score(X, labels))
+
+    elapsed = time.perf_counter() - start
+    rss_peak = peak_rss_mb()
+
+    # Silhouette hasil fit dihitung di luar timer (mode auto: sampled untuk n besar)
+    if stage.startswith("fit:"):
+        value = (
+            evaluate_silhouette(X, labels)["score"] if len(set(labels)) > 1 else None
+        )
+
+    value_key = "value" if stage in LINEAR_METRIC_STAGES else "silhouette"
+    queue.put({
+        "wall_time_s": elapsed,
+        "peak_rss_mb": rss_peak,
+        "rss_growth_mb": rss_peak - rss_before,
+        value_key: value,
+    })
+
+
+def run_case(n_rows, stage, timeout):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_case, args=(n_rows, stage, queue))
+    proc.start()
+    proc.join(timeout)
+
+    record = {"n_rows": n_rows, "stage": stage}
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+        record["status"] = "timeout"
+    elif proc.exitcode != 0:
+        record["status"] = f"error (exit {proc.exitcode})"
+    else:
+        record.update(queue.get(), status="ok")
+    return record
+
+
+# ======================================================
+# PERBANDINGAN BASELINE
+# ======================================================
+def compare_with_baseline(results, baseline, time_tolerance, rss_tolerance,
+                          min_time_delta):
+    reference = {(r["n_rows"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+
+    for r in results:
+        base = reference.get((r["n_rows"], r["stage"]))
+        if base is None or base.get("status") != "ok":
+            continue
+        if r["status"] != "ok":
+            regressions.append(f"{r['stage']} n={r['n_rows']}: {r['status']}")
+            continue
+        # Selisih absolut minimum mencegah alarm palsu pada tahap berdurasi milidetik
+        slow_limit = max(
+            base["wall_time_s"] * (1 + time_tolerance),
+            base["wall_time_s"] + min_time_delta
+        )
+        if r["wall_time_s"] > slow_limit:
+            regressions.append(
+                f"{r['stage']} n={r['n_rows']}: waktu {r['wall_time_s']:.2f}s "
+                f"> baseline {base['wall_time_s']:.2f}s"
+            )
+        if r["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_tolerance):
+            regressions.append(
+                f"{r['stage']} n={r['n_rows']}: peak RSS {r['peak_rss_mb']:.0f} MB "
+                f"> baseline {base['peak_rss_mb']:.0f} MB"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--timeout", type=float, default=900,
+                        help="Batas waktu per kasus (detik)")
+    parser.add_argument("--out", default=None, help="Tulis hasil JSON ke file")
+    parser.add_argument("--baseline", default=None,
+                        help="Bandingkan dengan baseline JSON; exit 1 bila ada regresi")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Simpan hasil sebagai baseline ({DEFAULT_BASELINE})")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--rss-tolerance", type=float, default=0.20)
+    parser.add_argument("--min-time-delta", type=float, default=0.05,
+                        help="Selisih waktu absolut minimum (detik) untuk dianggap regresi")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    results = []
+    for n_rows in args.sizes:
+        for stage in args.stages:
+            record = run_case(n_rows, stage, args.timeout)
+            results.append(record)
+            print(json.dumps(record, ensure_ascii=False), file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("cpu_count") != report["cpu_count"]:
+            print(
+                f"Peringatan: baseline direkam pada {baseline.get('cpu_count')} CPU, "
+                f"mesin ini {report['cpu_count']} CPU; rekam ulang dengan --save-baseline.",
+                file=sys.stderr
+            )
+        regressions = compare_with_baseline(
+            results, baseline, args.time_tolerance, args.rss_tolerance,
+            args.min_time_delta
+        )
+        if regressions:
+            print("Regresi terdeteksi:", file=sys.stderr)
+            for line in regressions:
+                print(f"  - {line}", file=sys.stderr)
+            sys.exit(1)
+        print("Tidak ada regresi terhadap baseline.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+# ======================================================
+# BENCHMARK COLD START
+# ======================================================
+# Setiap pengukuran berjalan di proses baru (spawn) untuk setiap mode
+# DASHBOARD_STARTUP:
+#   import_ms       : waktu import streamlit (lantai biaya startup)
+#   first_render_ms : render pertama app.py (halaman awal) via AppTest
+#   page_ms         : render pertama halaman --page setelah --think-time detik
+# Selain waktu, mode "lazy" gagal bila modul berat sudah termuat saat
+# render pertama.
+#
+# Contoh:
+#   python benchmarks/bench_cold_start.py
+#   python benchmarks/bench_cold_start.py --save-baseline
+#   python benchmarks/bench_cold_start.py --baseline benchmarks/baseline_cold_start.json
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline_cold_start.json")
+DEFAULT_PAGE = "📊 Visualisasi"
+METRICS = ("import_ms", "first_render_ms", "page_ms")
+
+HEAVY_MODULES = ("pandas", "sklearn", "scipy", "matplotlib", "seaborn", "altair", "pyarrow")
+
+
+def _run_case(mode, page, think_time, queue):
+    os.environ["DASHBOARD_STARTUP"] = mode
+    os.environ["DASHBOARD_PAGE_MODE"] = "lazy"
+    os.chdir(ROOT)
+    # `streamlit run` menaruh direktori app di sys.path untuk seluruh proses;
+    # AppTest hanya selama rerun, padahal thread warm-up mengimpor setelahnya
+    sys.path.insert(0, ROOT)
+
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    import_ms = (time.perf_counter() - start) * 1000
+
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    start = time.perf_counter()
+    at.run()
+    first_render_ms = (time.perf_counter() - start) * 1000
+    heavy_loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    # Jeda "pengguna membaca halaman awal", kesempatan bagi warm-up
+    time.sleep(think_time)
+
+    at.radio(key="active_page").set_value(page)
+    start = time.perf_counter()
+    at.run()
+    page_ms = (time.perf_counter() - start) * 1000
+
+    queue.put({
+        "import_ms": import_ms,
+        "first_render_ms": first_render_ms,
+        "page_ms": page_ms,
+        "heavy_at_first_render": heavy_loaded,
+        "error": str(at.exception[0].message) if at.exception else None,
+    })
+
+
+def run_case(mode, page, think_time, timeout=300):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_case, args=(mode, page, think_time, queue))
+    proc.start()
+    proc.join(timeout)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+        raise RuntimeError(f"Mode {mode}: timeout")
+    if proc.exitcode != 0:
+        raise RuntimeError(f"Mode {mode}: exit {proc.exitcode}")
+    return queue.get()
+
+
+def measure(mode, page, think_time, repeat):
+    runs = [run_case(mode, page, think_time) for _ in range(repeat)]
+    errors = [r["error"] for r in runs if r["error"]]
+    if errors:
+        raise RuntimeError(f"App error pada mode {mode}: {errors[0]}")
+
+    record = {"mode": mode, "page": page, "repeat": repeat}
+    for metric in METRICS:
+        record[metric] = statistics.median(r[metric] for r in runs)
+    record["heavy_at_first_render"] = runs[-1]["heavy_at_first_render"]
+    return record
+
+
+# ======================================================
+# PERBANDINGAN BUDGET
+# ======================================================
+def compare_with_baseline(results, baseline, tolerance, min_delta_ms):
+    reference = {r["mode"]: r for r in baseline["results"]}
+    regressions = []
+
+    for r in results:
+        if r["mode"] == "lazy" and r["heavy_at_first_render"]:
+            regressions.append(
+                "lazy: modul berat termuat sebelum halaman dibuka: "
+                + ", ".join(r["heavy_at_first_render"])
+            )
+
+        base = reference.get(r["mode"])
+        if base is None:
+            continue
+        for metric in METRICS:
+            limit = max(base[metric] * (1 + tolerance), base[metric] + min_delta_ms)
+            if r[metric] > limit:
+                regressions.append(
+                    f"{r['mode']} {metric}: {r[metric]:.0f} ms > budget {limit:.0f} ms "
+                    f"(baseline {base[metric]:.0f} ms)"
+                )
+    return regressions
+
+
+def main():
+    # Diimpor di sini, bukan di level modul: proses spawn mengimpor ulang modul
+    # ini dan import_ms harus diukur tanpa streamlit yang sudah termuat
+    sys.path.insert(0, ROOT)
+    from warmup import STARTUP_MODES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", default=list(STARTUP_MODES),
+                        choices=STARTUP_MODES)
+    parser.add_argument("--page", default=DEFAULT_PAGE)
+    parser.add_argument("--think-time", type=float, default=3.0,
+                        help="Jeda (detik) antara render pertama dan membuka --page")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=None,
+                        help="Bandingkan dengan baseline JSON; exit 1 bila melewati budget")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Simpan hasil sebagai baseline ({DEFAULT_BASELINE})")
+    parser.add_argument("--tolerance", type=float, default=0.30)
+    parser.add_argument("--min-delta-ms", type=float, default=150.0,
+                        help="Selisih absolut minimum (ms) untuk dianggap regresi")
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        record = measure(mode, args.page, args.think_time, args.repeat)
+        results.append(record)
+        print(json.dumps(record, ensure_ascii=False), file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "think_time_s": args.think_time,
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(
+            results, baseline, args.tolerance, args.min_delta_ms
+        )
+        if regressions:
+            print("Budget cold start terlampaui:", file=sys.stderr)
+            for line in regressions:
+                print(f"  - {line}", file=sys.stderr)
+            sys.exit(1)
+        print("Cold start dalam budget baseline.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+# ======================================================
+# BENCHMARK LATENSI RERUN: MODE "tabs" vs "lazy"
+# ======================================================
+# Menjalankan app.py secara headless (AppTest) dan mengukur waktu
+# setiap rerun ketika pengguna berada di satu halaman tertentu.
+# Contoh:
+#   python benchmarks/bench_page_mode.py --page "📬 Kontak" --reruns 20
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+
+def measure(mode, page, reruns):
+    os.environ["DASHBOARD_PAGE_MODE"] = mode
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.run()
+    if mode == "lazy":
+        at.radio(key="active_page").set_value(page)
+        at.run()
+
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    if at.exception:
+        raise RuntimeError(f"App error pada mode {mode}: {at.exception}")
+
+    return {
+        "mode": mode,
+        "page": page,
+        "reruns": reruns,
+        "mean_ms": statistics.mean(timings),
+        "median_ms": statistics.median(timings),
+        "max_ms": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", default="📬 Kontak")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    results = [measure(mode, args.page, args.reruns) for mode in ("tabs", "lazy")]
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"Halaman aktif: {args.page} | rerun: {args.reruns}")
+    for r in results:
+        print(
+            f"{r['mode']:>5}: mean {r['mean_ms']:8.1f} ms | "
+            f"median {r['median_ms']:8.1f} ms | max {r['max_ms']:8.1f} ms"
+        )
+    speedup = results[0]["median_ms"] / results[1]["median_ms"]
+    print(f"Percepatan median lazy vs tabs: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
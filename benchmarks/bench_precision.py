@@ -0,0 +1,210 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ======================================================
+# BENCHMARK PRESISI float32 vs float64
+# ======================================================
+# Untuk setiap dataset (climate_change_dataset.csv dan data sintetis) dan
+# setiap presisi, pipeline in-memory dijalankan di proses baru:
+#   scaling -> fit KMeans / Gaussian Mixture -> silhouette -> PCA -> scoring
+# Dicatat waktu per tahap, peak RSS, dan ukuran matriks terskala. Label
+# float32 dibandingkan dengan float64 (ARI dan persentase label identik),
+# begitu pula kualitasnya (selisih silhouette, rasio inertia KMeans). Pada data
+# tanpa struktur klaster yang tegas, ARI rendah dengan inertia setara berarti
+# KMeans jatuh ke optimum lokal lain yang sama baiknya, bukan galat presisi.
+#
+# Contoh:
+#   python benchmarks/bench_precision.py
+#   python benchmarks/bench_precision.py --datasets climate 100000 --out hasil.json
+#   python benchmarks/bench_precision.py --min-ari 0.99
+DEFAULT_DATASETS = ("climate", "100000", "1000000")
+PRECISIONS = ("float64", "float32")
+STAGES = ("scaling", "fit:KMeans", "fit:Gaussian Mixture", "metric:silhouette", "pca", "scoring")
+LABEL_STAGES = ("fit:KMeans", "fit:Gaussian Mixture", "scoring")
+
+BENCH_K = 4
+
+
+def peak_rss_mb():
+    # Linux melaporkan ru_maxrss dalam KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _load(dataset):
+    import pandas as pd
+
+    from synthetic import SOURCE_PATH, generate_climate_data
+
+    if dataset == "climate":
+        df = pd.read_csv(SOURCE_PATH)
+    else:
+        df = generate_climate_data(int(dataset))
+    return df.select_dtypes("number")
+
+
+def _run_case(dataset, precision, queue):
+    import numpy as np
+    from sklearn.cluster import KMeans
+    from sklearn.mixture import GaussianMixture
+
+    from cluster_metrics import evaluate_silhouette
+    from pca_plot import make_pca
+    from precision import scale_features
+    from scoring import assign_clusters_with_distance
+
+    numeric_df = _load(dataset)
+    rss_before = peak_rss_mb()
+    times = {}
+    labels = {}
+
+    def timed(stage, func):
+        start = time.perf_counter()
+        result = func()
+        times[stage] = time.perf_counter() - start
+        return result
+
+    scaler, X = timed("scaling", lambda: scale_features(numeric_df, precision))
+
+    kmeans = KMeans(n_clusters=BENCH_K, random_state=42)
+    labels["fit:KMeans"] = timed("fit:KMeans", lambda: kmeans.fit_predict(X))
+
+    gmm = GaussianMixture(n_components=BENCH_K, random_state=42)
+    labels["fit:Gaussian Mixture"] = timed("fit:Gaussian Mixture", lambda: gmm.fit_predict(X))
+
+    silhouette = timed(
+        "metric:silhouette", lambda: evaluate_silhouette(X, labels["fit:KMeans"])
+    )["score"]
+
+    pca = make_pca(len(X))
+    timed("pca", lambda: pca.fit_transform(X))
+
+    # Scoring ulang seluruh baris lewat bundle, seperti prediksi batch
+    bundle = {
+        "model": kmeans, "scaler": scaler, "features": list(numeric_df.columns),
+        "precision": precision
+    }
+    labels["scoring"], _ = timed(
+        "scoring", lambda: assign_clusters_with_distance(bundle, numeric_df)
+    )
+
+    rss_peak = peak_rss_mb()
+
+    # Inertia dievaluasi ulang dalam float64 agar kualitas kedua presisi sebanding
+    inertia = 0.0
+    for c in np.unique(labels["fit:KMeans"]):
+        members = X[labels["fit:KMeans"] == c].astype(np.float64)
+        inertia += float(((members - members.mean(axis=0)) ** 2).sum())
+
+    queue.put({
+        "n_rows": len(X),
+        "x_scaled_mb": X.nbytes / 2**20,
+        "centroid_dtype": str(kmeans.cluster_centers_.dtype),
+        "pca_dtype": str(pca.components_.dtype),
+        "times_s": times,
+        "peak_rss_mb": rss_peak,
+        "rss_growth_mb": rss_peak - rss_before,
+        "silhouette": silhouette,
+        "kmeans_inertia": inertia,
+        "labels": {stage: np.asarray(v, dtype=np.int32) for stage, v in labels.items()},
+    })
+
+
+def run_case(dataset, precision, timeout):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_case, args=(dataset, precision, queue))
+    proc.start()
+    # Hasil diambil sebelum join: label berukuran besar mengisi pipe queue
+    result = queue.get(timeout=timeout)
+    proc.join()
+    return result
+
+
+# ======================================================
+# PERBANDINGAN float32 TERHADAP float64
+# ======================================================
+def compare(reference, candidate):
+    import numpy as np
+    from sklearn.metrics import adjusted_rand_score
+
+    agreement = {}
+    for stage in LABEL_STAGES:
+        a, b = reference["labels"][stage], candidate["labels"][stage]
+        agreement[stage] = {
+            "ari": float(adjusted_rand_score(a, b)),
+            "identical_pct": float(np.mean(a == b) * 100),
+        }
+
+    speedup = {
+        stage: reference["times_s"][stage] / max(candidate["times_s"][stage], 1e-9)
+        for stage in STAGES
+    }
+    return {
+        "agreement": agreement,
+        "speedup": speedup,
+        "x_scaled_ratio": candidate["x_scaled_mb"] / reference["x_scaled_mb"],
+        "rss_growth_ratio": candidate["rss_growth_mb"] / max(reference["rss_growth_mb"], 1e-9),
+        "silhouette_delta": candidate["silhouette"] - reference["silhouette"],
+        "kmeans_inertia_ratio": candidate["kmeans_inertia"] / reference["kmeans_inertia"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--datasets", nargs="+", default=list(DEFAULT_DATASETS),
+                        help='"climate" atau jumlah baris data sintetis')
+    parser.add_argument("--timeout", type=float, default=1800,
+                        help="Batas waktu per kasus (detik)")
+    parser.add_argument("--out", default=None, help="Tulis hasil JSON ke file")
+    parser.add_argument("--min-ari", type=float, default=None,
+                        help="Exit 1 bila ARI float32 vs float64 di bawah nilai ini")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": [],
+    }
+    failures = []
+
+    for dataset in args.datasets:
+        runs = {p: run_case(dataset, p, args.timeout) for p in PRECISIONS}
+        record = {"dataset": dataset, "n_rows": runs["float64"]["n_rows"]}
+        for p, run in runs.items():
+            record[p] = {k: v for k, v in run.items() if k not in ("labels", "n_rows")}
+        record["float32_vs_float64"] = compare(runs["float64"], runs["float32"])
+        report["results"].append(record)
+        print(json.dumps(record, ensure_ascii=False), file=sys.stderr)
+
+        if args.min_ari is not None:
+            for stage, value in record["float32_vs_float64"]["agreement"].items():
+                if value["ari"] < args.min_ari:
+                    failures.append(f"{dataset} {stage}: ARI {value['ari']:.4f} < {args.min_ari}")
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if failures:
+        print("Label float32 menyimpang dari float64:", file=sys.stderr)
+        for line in failures:
+            print(f"  - {line}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from model_registry import latest_model_path, load_bundle  # noqa: E402
+from scoring_service import create_server  # noqa: E402
+
+# ======================================================
+# LOAD TEST LAYANAN SCORING (CLIENT LOKAL)
+# ======================================================
+# Menjalankan scoring_service di port lokal, lalu mengirim permintaan
+# satu baris secara bersamaan dari beberapa thread client.
+# Contoh:
+#   python benchmarks/load_test_service.py --clients 32 --requests 200
+
+
+def post_json(url, payload):
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req) as resp:
+        return json.load(resp)
+
+
+def run_client(url, rows, n_requests, latencies, errors):
+    for i in range(n_requests):
+        start = time.perf_counter()
+        try:
+            post_json(url, rows[i % len(rows)])
+            latencies.append((time.perf_counter() - start) * 1000)
+        except Exception as exc:
+            errors.append(str(exc))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None,
+                        help="URL layanan yang sudah berjalan; default menjalankan server lokal")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=100,
+                        help="Jumlah permintaan per client")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    bundle = load_bundle(args.model or latest_model_path())
+    rows = (
+        pd.read_csv("climate_change_dataset.csv")[bundle["features"]]
+        .head(500)
+        .to_dict(orient="records")
+    )
+
+    server = None
+    url = args.url
+    if url is None:
+        server, _ = create_server(
+            bundle, port=0,
+            max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(f"{url}/predict", rows, args.requests, latencies, errors)
+        )
+        for _ in range(args.clients)
+    ]
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    with urllib.request.urlopen(f"{url}/stats") as resp:
+        server_stats = json.load(resp)
+
+    latencies.sort()
+    report = {
+        "clients": args.clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": elapsed,
+        "client_throughput_rps": len(latencies) / elapsed,
+        "client_latency_ms": {
+            "p50": statistics.median(latencies),
+            "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        },
+        "server": server_stats,
+    }
+    print(json.dumps(report, indent=2))
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# DATA SINTETIS BERSKEMA climate_change_dataset.csv
+# ======================================================
+# Setiap kolom numerik diambil dari distribusi empiris kolom aslinya
+# (inverse CDF dengan interpolasi kuantil), Country dari frekuensi aslinya,
+# sehingga skema, rentang, dan distribusi marginal tetap sama pada n berapa pun.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(ROOT, "climate_change_dataset.csv")
+
+INTEGER_COLUMNS = ("Year", "Rainfall (mm)", "Population", "Extreme Weather Events")
+
+
+def generate_climate_data(n_rows, random_state=42, source_path=SOURCE_PATH):
+    source = pd.read_csv(source_path)
+    rng = np.random.default_rng(random_state)
+
+    data = {}
+    for column in source.columns:
+        values = source[column]
+        if not pd.api.types.is_numeric_dtype(values):
+            freq = values.value_counts(normalize=True)
+            data[column] = rng.choice(freq.index.to_numpy(), size=n_rows, p=freq.to_numpy())
+            continue
+
+        sampled = np.quantile(values.to_numpy(), rng.random(n_rows))
+        if column in INTEGER_COLUMNS:
+            sampled = np.round(sampled).astype(np.int64)
+        else:
+            sampled = np.round(sampled, 1)
+        data[column] = sampled
+
+    return pd.DataFrame(data, columns=source.columns)
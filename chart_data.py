@@ -0,0 +1,88 @@
+import numpy as np
+
+from aggregate_cube import cube_mean, rollup, select_countries
+
+# ======================================================
+# AGREGASI SISI SERVER UNTUK GRAFIK ALTAIR
+# ======================================================
+# Setiap grafik hanya menerima baris yang benar-benar digambar, sehingga
+# ukuran spesifikasi Vega-Lite tidak ikut membesar bersama dataset:
+# - tren   : rata-rata per Country x Year langsung dari cube agregat; di atas
+#            budget negara teratas saja dan tahun digabung per periode
+# - bar    : roll-up cube ke Country; di atas budget negara teratas saja
+# - titik  : kolom yang dipakai saja; di atas budget diringkas per bin 2D
+#            (rata-rata posisi/nilai + "Jumlah" observasi per bin)
+# Budget default sama dengan batas max_rows bawaan Altair.
+CHART_ROW_BUDGET = 5_000
+COUNT_COLUMN = "Jumlah"
+
+
+def trend_data(cube, value, countries=None, budget=CHART_ROW_BUDGET):
+    # Return (data, lebar periode dalam tahun, True bila negara dipotong).
+    # Di atas budget hanya `budget` negara dengan observasi terbanyak yang
+    # dipakai, lalu tahun digabung per periode; rata-rata tetap sum / count
+    subset = select_countries(cube, countries)
+    observations = subset["count"][value].groupby(level="Country").sum()
+    truncated = len(observations) > budget
+    if truncated:
+        subset = select_countries(subset, observations.nlargest(budget).index)
+
+    index = subset["count"].index
+    years = index.get_level_values("Year")
+    n_cells = index.get_level_values("Country").nunique() * years.nunique()
+    if n_cells <= budget:
+        return cube_mean(subset)[[value]].reset_index(), 1, truncated
+
+    # Periode dipilih agar negara x periode tidak melebihi budget
+    step = int(np.ceil(n_cells / budget))
+    keys = [index.get_level_values("Country"), years.min() + (years - years.min()) // step * step]
+    totals = subset["sum"][value].groupby(keys).sum()
+    counts = subset["count"][value].groupby(keys).sum()
+    return (totals / counts).rename(value).reset_index(), step, truncated
+
+
+def country_mean_data(cube, value, countries=None, budget=CHART_ROW_BUDGET):
+    # Return (data, True bila dipotong ke `budget` negara dengan nilai tertinggi)
+    means = cube_mean(rollup(select_countries(cube, countries), "Country"))[value]
+    if len(means) <= budget:
+        return means.reset_index(), False
+    return means.nlargest(budget).reset_index(), True
+
+
+def point_data(df, x, y, values=(), by=None, detail=(), budget=CHART_ROW_BUDGET):
+    # Return (data, True bila diringkas per bin); kolom `detail` (mis. tooltip
+    # Country) hanya ikut selama baris belum diringkas
+    keys = [by] if by else []
+    columns = list(dict.fromkeys(keys + [x, y, *values]))
+
+    if len(df) <= budget:
+        raw_columns = list(dict.fromkeys([*detail, *columns]))
+        return df[raw_columns].assign(**{COUNT_COLUMN: 1}), False
+
+    # Jumlah bin per sumbu dipilih agar grup x bin x bin tidak melebihi budget
+    n_groups = df[by].nunique() if by else 1
+    bins = max(2, int(np.sqrt(budget / n_groups)))
+
+    keyed = df[columns].assign(
+        _bin_x=_bin_index(df[x], bins),
+        _bin_y=_bin_index(df[y], bins)
+    )
+
+    aggregations = {c: (c, "mean") for c in [x, y, *values]}
+    aggregations[COUNT_COLUMN] = (x, "size")
+
+    binned = (
+        keyed.groupby(keys + ["_bin_x", "_bin_y"], observed=True)
+        .agg(**aggregations)
+        .reset_index()
+    )
+    return binned[columns + [COUNT_COLUMN]], True
+
+
+def _bin_index(values, bins):
+    # Indeks bin equal-width; kolom bernilai konstan jatuh seluruhnya di bin 0
+    values = values.to_numpy(dtype=float)
+    low, high = np.nanmin(values), np.nanmax(values)
+    if high == low:
+        return np.zeros(len(values), dtype=int)
+    return np.minimum(((values - low) / (high - low) * bins).astype(int), bins - 1)
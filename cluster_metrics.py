@@ -0,0 +1,124 @@
+import numpy as np
+from sklearn.metrics import pairwise_distances, silhouette_samples, silhouette_score
+
+# ======================================================
+# MODE EVALUASI SILHOUETTE
+# ======================================================
+# "auto"    : exact untuk data kecil, sampled di atas AUTO_EXACT_MAX_ROWS
+# "exact"   : silhouette_score sklearn pada seluruh data
+# "chunked" : exact, dihitung per blok baris dengan memori terbatas
+# "sampled" : sampel terstratifikasi per label + interval kepercayaan 95%
+SILHOUETTE_MODES = ("auto", "exact", "chunked", "sampled")
+
+AUTO_EXACT_MAX_ROWS = 20_000
+DEFAULT_SAMPLE_SIZE = 10_000
+DEFAULT_MEMORY_MB = 256
+Z_95 = 1.96
+
+
+def resolve_mode(mode, n_rows):
+    if mode not in SILHOUETTE_MODES:
+        raise ValueError(f"Mode silhouette tidak dikenal: {mode}")
+    if mode == "auto":
+        return "exact" if n_rows <= AUTO_EXACT_MAX_ROWS else "sampled"
+    return mode
+
+
+# ======================================================
+# SAMPLING TERSTRATIFIKASI
+# ======================================================
+def stratified_sample_index(labels, sample_size, random_state=42):
+    labels = np.asarray(labels)
+    n = len(labels)
+    if sample_size >= n:
+        return np.arange(n)
+
+    rng = np.random.default_rng(random_state)
+    uniq, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+
+    # Alokasi proporsional, minimal 2 titik per klaster agar nilai a(i) terdefinisi
+    quota = np.maximum(np.round(sample_size * counts / n).astype(int), 2)
+    quota = np.minimum(quota, counts)
+
+    index = [
+        rng.choice(np.flatnonzero(inverse == i), size=quota[i], replace=False)
+        for i in range(len(uniq))
+    ]
+    return np.sort(np.concatenate(index))
+
+
+# ======================================================
+# SILHOUETTE CHUNKED (EXACT, MEMORI TERBATAS)
+# ======================================================
+def chunked_silhouette_score(X, labels, memory_mb=DEFAULT_MEMORY_MB):
+    X = np.asarray(X)
+    labels = np.asarray(labels)
+    n = len(labels)
+
+    uniq, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    onehot = np.zeros((n, len(uniq)), dtype=X.dtype)
+    onehot[np.arange(n), inverse] = 1
+
+    # Satu blok jarak berukuran chunk x n
+    chunk = max(1, int(memory_mb * 2**20 // (n * X.itemsize)))
+    sil = np.empty(n, dtype=np.float64)
+
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        cluster_sums = pairwise_distances(X[start:stop], X) @ onehot
+        own = inverse[start:stop]
+        rows = np.arange(stop - start)
+
+        own_counts = counts[own]
+        a = cluster_sums[rows, own] / np.maximum(own_counts - 1, 1)
+
+        mean_other = cluster_sums / counts
+        mean_other[rows, own] = np.inf
+        b = mean_other.min(axis=1)
+
+        s = (b - a) / np.maximum(a, b)
+        # Konvensi sklearn: klaster berisi satu titik bernilai 0
+        s[own_counts == 1] = 0.0
+        sil[start:stop] = np.nan_to_num(s)
+
+    return float(sil.mean())
+
+
+# ======================================================
+# API
+# ======================================================
+def evaluate_silhouette(
+    X,
+    labels,
+    mode="auto",
+    sample_size=DEFAULT_SAMPLE_SIZE,
+    memory_mb=DEFAULT_MEMORY_MB,
+    random_state=42,
+):
+    n = len(labels)
+    mode = resolve_mode(mode, n)
+    result = {"mode": mode, "n_used": n, "ci_low": np.nan, "ci_high": np.nan}
+
+    if mode == "exact":
+        result["score"] = float(silhouette_score(X, labels))
+
+    elif mode == "chunked":
+        result["score"] = chunked_silhouette_score(X, labels, memory_mb)
+
+    else:
+        index = stratified_sample_index(labels, sample_size, random_state)
+        X_s, labels_s = np.asarray(X)[index], np.asarray(labels)[index]
+        if len(np.unique(labels_s)) < 2:
+            result.update(score=np.nan, n_used=len(index))
+            return result
+
+        values = silhouette_samples(X_s, labels_s)
+        half_width = Z_95 * values.std(ddof=1) / np.sqrt(len(values))
+        result.update(
+            score=float(values.mean()),
+            n_used=len(index),
+            ci_low=float(values.mean() - half_width),
+            ci_high=float(values.mean() + half_width),
+        )
+
+    return result
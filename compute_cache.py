@@ -0,0 +1,122 @@
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# CACHE KOMPUTASI BERSAMA ANTAR SESI (SINGLE-FLIGHT)
+# ======================================================
+# Kunci: (hash isi upload, algoritma, max_k, parameter lain yang mengubah
+# hasil). Permintaan identik yang datang bersamaan menunggu satu komputasi
+# (single-flight) alih-alih menghitung ulang. Hasil disimpan dalam LRU yang
+# dibatasi total byte perkiraan; entri terlama dibuang lebih dulu.
+COMPUTE_CACHE_MAX_BYTES = 512 * 2**20
+
+_COMPUTE_CACHE = OrderedDict()
+_IN_FLIGHT = {}
+_COMPUTE_STATS = {
+    "computes": 0, "hits": 0, "waits": 0, "errors": 0, "evictions": 0,
+    "bytes": 0, "saved_s": 0.0,
+}
+_COMPUTE_LOCK = threading.Lock()
+
+
+class _SizeWriter:
+    # File-like untuk pickle.dump: hanya menghitung byte, tanpa menyimpannya
+    def __init__(self):
+        self.nbytes = 0
+
+    def write(self, data):
+        nbytes = memoryview(data).nbytes
+        self.nbytes += nbytes
+        return nbytes
+
+
+def estimate_nbytes(value):
+    # Perkiraan memori: array numpy / DataFrame dihitung penuh, objek lain
+    # (model, KDTree, CF-tree BIRCH bersarang, ...) lewat panjang pickle-nya
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value)
+
+    writer = _SizeWriter()
+    try:
+        pickle.dump(value, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return sys.getsizeof(value)
+    return writer.nbytes
+
+
+def _store(key, value, nbytes, compute_s, max_bytes):
+    # Dipanggil dengan _COMPUTE_LOCK terkunci
+    if nbytes > max_bytes:
+        return
+    _COMPUTE_CACHE[key] = {"value": value, "nbytes": nbytes, "compute_s": compute_s}
+    _COMPUTE_STATS["bytes"] += nbytes
+    while _COMPUTE_STATS["bytes"] > max_bytes:
+        _, evicted = _COMPUTE_CACHE.popitem(last=False)
+        _COMPUTE_STATS["bytes"] -= evicted["nbytes"]
+        _COMPUTE_STATS["evictions"] += 1
+
+
+def shared_compute(key, compute, max_bytes=COMPUTE_CACHE_MAX_BYTES):
+    # Return (hasil, sumber): "computed", "cache", atau "waited"
+    with _COMPUTE_LOCK:
+        entry = _COMPUTE_CACHE.get(key)
+        if entry is not None:
+            _COMPUTE_CACHE.move_to_end(key)
+            _COMPUTE_STATS["hits"] += 1
+            _COMPUTE_STATS["saved_s"] += entry["compute_s"]
+            return entry["value"], "cache"
+
+        flight = _IN_FLIGHT.get(key)
+        leader = flight is None
+        if leader:
+            flight = {"event": threading.Event(), "value": None, "error": None, "compute_s": 0.0}
+            _IN_FLIGHT[key] = flight
+
+    if not leader:
+        flight["event"].wait()
+        if flight["error"] is not None:
+            raise flight["error"]
+        with _COMPUTE_LOCK:
+            _COMPUTE_STATS["waits"] += 1
+            _COMPUTE_STATS["saved_s"] += flight["compute_s"]
+        return flight["value"], "waited"
+
+    start = time.perf_counter()
+    try:
+        value = compute()
+    except BaseException as exc:
+        # Error tidak di-cache; penunggu menerima error yang sama
+        flight["error"] = exc
+        with _COMPUTE_LOCK:
+            _COMPUTE_STATS["errors"] += 1
+            del _IN_FLIGHT[key]
+        flight["event"].set()
+        raise
+
+    compute_s = time.perf_counter() - start
+    # Ukuran diperkirakan di luar lock
+    nbytes = estimate_nbytes(value)
+    flight["value"], flight["compute_s"] = value, compute_s
+    with _COMPUTE_LOCK:
+        _COMPUTE_STATS["computes"] += 1
+        _store(key, value, nbytes, compute_s, max_bytes)
+        del _IN_FLIGHT[key]
+    flight["event"].set()
+    return value, "computed"
+
+
+def compute_cache_stats():
+    with _COMPUTE_LOCK:
+        return dict(_COMPUTE_STATS, entries=len(_COMPUTE_CACHE), in_flight=len(_IN_FLIGHT))
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from page_state import state_key
+
 def contact_tab():
 
     # =====================================================
@@ -87,9 +89,9 @@ def contact_tab():
     st.info("Gunakan form ini untuk mengirim pertanyaan atau saran terkait dashboard")
 
     with st.form("contact_form", clear_on_submit=True):
-        nama = st.text_input("Nama")
-        email = st.text_input("Email")
-        pesan = st.text_area("Pesan / Feedback")
+        nama = st.text_input("Nama", key=state_key("contact_nama", ""))
+        email = st.text_input("Email", key=state_key("contact_email", ""))
+        pesan = st.text_area("Pesan / Feedback", key=state_key("contact_pesan", ""))
         kirim = st.form_submit_button("Kirim")
 
         if kirim:
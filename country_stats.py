@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# STATISTIK CUKUP PER NEGARA
+# ======================================================
+# Sekali per versi dataset dihitung, untuk setiap negara: jumlah baris,
+# jumlah nilai (p) dan matriks cross-product (p x p). Rata-rata dan korelasi
+# untuk subset negara mana pun cukup dijumlahkan dari statistik ini dalam
+# O(negara x p^2), tanpa memindai ulang baris data.
+CORR_COLUMNS = [
+    'Avg Temperature (°C)',
+    'CO2 Emissions (Tons/Capita)',
+    'Sea Level Rise (mm)',
+    'Rainfall (mm)',
+    'Renewable Energy (%)',
+    'Extreme Weather Events',
+    'Forest Area (%)'
+]
+
+# Cache level proses: (versi dataset, kolom) -> statistik
+_STATS_CACHE = OrderedDict()
+_STATS_CACHE_SIZE = 4
+_STATS_LOCK = threading.Lock()
+
+
+def _compute_stats(df, columns):
+    # Baris dengan nilai kosong dibuang utuh (complete case); pada data
+    # tanpa NaN hasilnya identik dengan DataFrame.corr()
+    complete = df[["Country", *columns]].dropna()
+    codes, countries = pd.factorize(complete["Country"], sort=True)
+    X = complete[columns].to_numpy(dtype=np.float64)
+
+    count = np.bincount(codes, minlength=len(countries))
+    order = np.argsort(codes, kind="stable")
+    segments = np.split(X[order], np.cumsum(count)[:-1])
+
+    return {
+        "columns": list(columns),
+        "countries": list(countries),
+        "count": count,
+        "sum": np.array([seg.sum(axis=0) for seg in segments]),
+        "cross": np.array([seg.T @ seg for seg in segments]),
+    }
+
+
+def _merge_stats(stats, other):
+    # Statistik cukup aditif: negara baru ditambahkan, negara lama dijumlahkan
+    countries = sorted(set(stats["countries"]) | set(other["countries"]))
+    position = {c: i for i, c in enumerate(countries)}
+    p = len(stats["columns"])
+    merged = {
+        "columns": stats["columns"],
+        "countries": countries,
+        "count": np.zeros(len(countries), dtype=np.int64),
+        "sum": np.zeros((len(countries), p)),
+        "cross": np.zeros((len(countries), p, p)),
+    }
+    for part in (stats, other):
+        index = [position[c] for c in part["countries"]]
+        for field in ("count", "sum", "cross"):
+            merged[field][index] += part[field]
+    return merged
+
+
+def country_stats(df, version, columns=CORR_COLUMNS, base=None):
+    # (df, version, base) dari satu snapshot load_dataset(); bila statistik versi base
+    # masih di cache, hanya baris df[rows:] yang dihitung
+    key = (version, tuple(columns))
+    with _STATS_LOCK:
+        if key in _STATS_CACHE:
+            _STATS_CACHE.move_to_end(key)
+            return _STATS_CACHE[key]
+        previous = None if base is None else _STATS_CACHE.get((base["hash"], tuple(columns)))
+
+    if previous is not None:
+        stats = _merge_stats(previous, _compute_stats(df.iloc[base["rows"]:], list(columns)))
+    else:
+        stats = _compute_stats(df, list(columns))
+
+    with _STATS_LOCK:
+        _STATS_CACHE[key] = stats
+        while len(_STATS_CACHE) > _STATS_CACHE_SIZE:
+            _STATS_CACHE.popitem(last=False)
+    return stats
+
+
+# ======================================================
+# KOMPOSISI UNTUK SUBSET NEGARA
+# ======================================================
+def pooled_stats(stats, countries=None):
+    # countries None berarti seluruh negara
+    if countries is None:
+        mask = slice(None)
+    else:
+        wanted = set(countries)
+        mask = np.array([c in wanted for c in stats["countries"]], dtype=bool)
+    return (
+        stats["count"][mask].sum(),
+        stats["sum"][mask].sum(axis=0),
+        stats["cross"][mask].sum(axis=0),
+    )
+
+
+def stats_corr(stats, countries=None):
+    n, total, cross = pooled_stats(stats, countries)
+    columns = stats["columns"]
+    if n < 2:
+        return pd.DataFrame(np.nan, index=columns, columns=columns)
+
+    cov = (cross - np.outer(total, total) / n) / (n - 1)
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.clip(cov / np.outer(std, std), -1, 1)
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return pd.DataFrame(corr, index=columns, columns=columns)
@@ -0,0 +1,201 @@
+import hashlib
+import io
+import os
+import threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# ======================================================
+# KONFIGURASI DATASET
+# ======================================================
+DATASET_PATH = "climate_change_dataset.csv"
+
+# Tipe data eksplisit: Country kategorikal, Year int16,
+# indikator kontinu float32 (Population tetap int64 agar lossless)
+DATASET_DTYPES = {
+    "Year": "int16",
+    "Country": "category",
+    "Avg Temperature (°C)": "float32",
+    "CO2 Emissions (Tons/Capita)": "float32",
+    "Sea Level Rise (mm)": "float32",
+    "Rainfall (mm)": "float32",
+    "Population": "int64",
+    "Renewable Energy (%)": "float32",
+    "Extreme Weather Events": "int16",
+    "Forest Area (%)": "float32",
+}
+
+SIDECAR_HASH_KEY = b"source_sha256"
+
+# Cache level proses: path absolut -> entry {stat, hash, size, df, base}
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+# ======================================================
+# UTILITAS
+# ======================================================
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stream_sha256(file, chunk_size=1 << 20):
+    # File-like (mis. UploadedFile Streamlit); posisi dikembalikan ke awal
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def sidecar_path(path):
+    return os.path.splitext(path)[0] + ".parquet"
+
+
+def _file_stat(path):
+    st_ = os.stat(path)
+    return (st_.st_mtime_ns, st_.st_size)
+
+
+def _read_sidecar(path, source_hash):
+    # Sidecar hanya dipakai bila hash sumbernya sama dengan CSV saat ini
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+
+    parquet_file = sidecar_path(path)
+    if not os.path.exists(parquet_file):
+        return None
+
+    try:
+        metadata = pq.read_schema(parquet_file).metadata or {}
+        if metadata.get(SIDECAR_HASH_KEY, b"").decode() != source_hash:
+            return None
+        return pd.read_parquet(parquet_file)
+    except Exception:
+        return None
+
+
+def _write_sidecar(path, df, source_hash):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return
+
+    parquet_file = sidecar_path(path)
+    tmp_file = f"{parquet_file}.{os.getpid()}.tmp"
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[SIDECAR_HASH_KEY] = source_hash.encode()
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_file)
+        os.replace(tmp_file, parquet_file)
+    except OSError:
+        # Direktori read-only: lanjut tanpa sidecar
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def _parse_csv(path):
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {c: t for c, t in DATASET_DTYPES.items() if c in header}
+    return pd.read_csv(path, dtype=dtypes)
+
+
+# ======================================================
+# APPEND INKREMENTAL
+# ======================================================
+def _append_hash(path, old_size, old_hash, chunk_size=1 << 20):
+    # Satu kali baca: awalan sepanjang file lama harus diakhiri newline dan
+    # ber-hash sama, lalu digest yang sama dilanjutkan ke byte baru.
+    # Return hash file baru, atau None bila perubahan bukan append
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining, last = old_size, b""
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                return None
+            digest.update(chunk)
+            remaining -= len(chunk)
+            last = chunk
+        if not last.endswith(b"\n") or digest.hexdigest() != old_hash:
+            return None
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_tail(path, offset, columns):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        tail = f.read()
+    dtypes = {c: t for c, t in DATASET_DTYPES.items() if c in columns}
+    return pd.read_csv(io.BytesIO(tail), header=None, names=columns, dtype=dtypes)
+
+
+def _append_rows(df, tail):
+    # Kolom kategori digabung lewat union_categoricals (concat biasa menjadi
+    # object bila kategorinya berbeda)
+    categorical = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    combined = pd.concat(
+        [df.drop(columns=categorical), tail.drop(columns=categorical)], ignore_index=True
+    )
+    for column in categorical:
+        combined[column] = union_categoricals([df[column], tail[column]])
+    return combined[df.columns]
+
+
+# ======================================================
+# LOAD DATASET (SEKALI PER PROSES)
+# ======================================================
+def load_dataset(path=DATASET_PATH):
+    # Return (df, hash, base) dari satu snapshot yang konsisten. base berisi
+    # {hash, rows} versi sebelumnya bila versi ini hasil append (baris df[rows:]
+    # adalah satu-satunya baris baru), selain itu None
+    path = os.path.abspath(path)
+    stat = _file_stat(path)
+
+    with _LOCK:
+        entry = _CACHE.get(path)
+        if entry is None or entry["stat"] != stat:
+            entry = _refresh(path, stat, entry)
+            _CACHE[path] = entry
+        return entry["df"], entry["hash"], entry["base"]
+
+
+def _refresh(path, stat, entry):
+    # Dipanggil dengan _LOCK terkunci; return entry cache untuk `stat`
+    size = stat[1]
+    if entry is not None and size > entry["size"]:
+        # Baris baru di akhir file: hanya ekor yang di-parse. Sidecar tidak
+        # ditulis ulang (O(n)); proses baru mem-parse CSV sekali lalu menulisnya.
+        source_hash = _append_hash(path, entry["size"], entry["hash"])
+        if source_hash is not None:
+            tail = _read_tail(path, entry["size"], entry["df"].columns)
+            return {
+                "stat": stat, "hash": source_hash, "size": size,
+                "df": _append_rows(entry["df"], tail),
+                "base": {"hash": entry["hash"], "rows": len(entry["df"])},
+            }
+
+    # mtime berubah: cek hash sebelum parsing ulang
+    source_hash = file_sha256(path)
+    if entry is not None and entry["hash"] == source_hash:
+        return {**entry, "stat": stat}
+
+    df = _read_sidecar(path, source_hash)
+    if df is None:
+        df = _parse_csv(path)
+        _write_sidecar(path, df, source_hash)
+
+    return {"stat": stat, "hash": source_hash, "size": size, "df": df, "base": None}
@@ -0,0 +1,143 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.cluster import DBSCAN
+from sklearn.neighbors import NearestNeighbors
+
+from k_search import array_fingerprint
+
+# ======================================================
+# TUNING DBSCAN DENGAN GRAF RADIUS YANG DIPAKAI ULANG
+# ======================================================
+# Graf radius-neighbours (jarak) dihitung sekali pada eps maksimum. Setiap eps
+# dalam sweep cukup memfilter sisi graf tersebut, tanpa pencarian tetangga baru:
+# - sweep : titik inti + komponen terhubung antar titik inti langsung dari graf
+# - final : DBSCAN sklearn dengan metric="precomputed" pada graf yang sama
+DEFAULT_EPS = 0.7
+DEFAULT_MIN_SAMPLES = 5
+
+# Cache level proses: (hash X, eps maksimum) -> graf CSR
+_GRAPH_CACHE = OrderedDict()
+_GRAPH_CACHE_SIZE = 2
+_GRAPH_LOCK = threading.Lock()
+
+# Cache level proses: (hash X, min_samples) -> kurva k-distance terurut
+_KDIST_CACHE = OrderedDict()
+_KDIST_CACHE_SIZE = 2
+_KDIST_LOCK = threading.Lock()
+
+
+# ======================================================
+# K-DISTANCE
+# ======================================================
+def k_distance_curve(X, min_samples=DEFAULT_MIN_SAMPLES):
+    # Jarak ke tetangga ke-min_samples (termasuk titik itu sendiri), diurutkan naik
+    key = (array_fingerprint(X), int(min_samples))
+    with _KDIST_LOCK:
+        if key in _KDIST_CACHE:
+            _KDIST_CACHE.move_to_end(key)
+            return _KDIST_CACHE[key]
+
+    nn = NearestNeighbors(n_neighbors=min_samples).fit(X)
+    distances, _ = nn.kneighbors(X)
+    curve = np.sort(distances[:, -1])
+
+    with _KDIST_LOCK:
+        _KDIST_CACHE[key] = curve
+        while len(_KDIST_CACHE) > _KDIST_CACHE_SIZE:
+            _KDIST_CACHE.popitem(last=False)
+    return curve
+
+
+def suggest_eps(k_distances):
+    # Titik "siku": jarak terjauh dari garis lurus ujung-ke-ujung kurva
+    y = np.asarray(k_distances)
+    if len(y) < 3 or y[-1] == y[0]:
+        return float(y[-1]) if len(y) else DEFAULT_EPS
+    x = np.linspace(0, 1, len(y))
+    y_norm = (y - y[0]) / (y[-1] - y[0])
+    return float(y[np.argmax(x - y_norm)])
+
+
+# ======================================================
+# GRAF RADIUS
+# ======================================================
+def radius_graph(X, max_eps):
+    key = (array_fingerprint(X), float(max_eps))
+    with _GRAPH_LOCK:
+        if key in _GRAPH_CACHE:
+            _GRAPH_CACHE.move_to_end(key)
+            return _GRAPH_CACHE[key]
+
+    graph = (
+        NearestNeighbors(radius=max_eps)
+        .fit(X)
+        .radius_neighbors_graph(X, mode="distance")
+        .tocsr()
+    )
+
+    with _GRAPH_LOCK:
+        _GRAPH_CACHE[key] = graph
+        while len(_GRAPH_CACHE) > _GRAPH_CACHE_SIZE:
+            _GRAPH_CACHE.popitem(last=False)
+    return graph
+
+
+def graph_at_eps(graph, eps):
+    # Filter sisi per baris tanpa konversi format; sisi berjarak 0 (diri sendiri,
+    # duplikat) tetap tersimpan eksplisit agar dihitung sebagai tetangga
+    keep = graph.data <= eps
+    kept_before = np.concatenate([[0], np.cumsum(keep)])
+    return sparse.csr_matrix(
+        (graph.data[keep], graph.indices[keep], kept_before[graph.indptr]),
+        shape=graph.shape
+    )
+
+
+def fit_dbscan(X, eps, min_samples, graph=None):
+    if graph is None:
+        model = DBSCAN(eps=eps, min_samples=min_samples)
+        return model, model.fit_predict(X)
+    model = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed")
+    return model, model.fit_predict(graph_at_eps(graph, eps))
+
+
+def dbscan_labels_from_graph(graph, min_samples):
+    # Label titik inti identik dengan DBSCAN sklearn (urutan penemuan sama);
+    # titik border yang bersinggungan dengan dua klaster bisa berbeda klaster
+    degree = np.diff(graph.indptr)
+    core = degree >= min_samples
+    labels = np.full(graph.shape[0], -1)
+
+    core_idx = np.flatnonzero(core)
+    if len(core_idx) == 0:
+        return labels, core_idx
+
+    # Topologi saja (bobot 1) agar sisi berjarak 0 tidak dianggap "tanpa sisi"
+    core_graph = graph[core][:, core]
+    core_graph.data = np.ones_like(core_graph.data)
+    _, components = connected_components(core_graph, directed=False)
+    labels[core_idx] = components
+
+    border_graph = graph[~core][:, core]
+    has_core = np.diff(border_graph.indptr) > 0
+    first_core = border_graph.indices[border_graph.indptr[:-1][has_core]]
+    labels[np.flatnonzero(~core)[has_core]] = components[first_core]
+    return labels, core_idx
+
+
+def dbscan_sweep(graph, eps_values, min_samples=DEFAULT_MIN_SAMPLES):
+    records = []
+    for eps in eps_values:
+        labels, core_idx = dbscan_labels_from_graph(graph_at_eps(graph, eps), min_samples)
+        n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
+        records.append({
+            "eps": float(eps),
+            "Jumlah Klaster": n_clusters,
+            "Noise (%)": float(np.mean(labels == -1) * 100),
+            "Titik Inti": len(core_idx),
+        })
+    return records
@@ -0,0 +1,222 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# ======================================================
+# INGESTI CSV HEMAT MEMORI UNTUK UPLOAD
+# ======================================================
+# - Sampel awal menentukan kolom numerik dan memperkirakan memori
+# - File dibaca per blok dengan engine CSV pyarrow; kolom teks menjadi kategori
+# - Kolom numerik diturunkan ke int32 / float32 bila lossless:
+#   integer tetap dalam rentang int32, dan desimal tetap sama pada presisi
+#   desimal yang tertulis di CSV (diverifikasi pada seluruh kolom)
+# - Bila perkiraan peak memori melebihi budget: tolak, atau ambil sampel
+#   acak per chunk sehingga peak tetap dibatasi
+DEFAULT_UPLOAD_BUDGET_MB = 512
+OVER_BUDGET_ACTIONS = ("sample", "reject")
+PLAN_SAMPLE_ROWS = 10_000
+INGEST_CHUNKSIZE = 100_000
+INGEST_BLOCK_BYTES = 8 * 2**20
+MAX_DECIMALS = 6
+
+# Perkiraan peak per sel numerik: hasil ramping + cadangan satu blok float64
+_NUMERIC_PEAK_BYTES = 8
+
+_INT32 = np.iinfo(np.int32)
+
+
+# ======================================================
+# DOWNCAST LOSSLESS
+# ======================================================
+def _decimals(values):
+    finite = values[np.isfinite(values)]
+    for d in range(MAX_DECIMALS + 1):
+        scaled = finite * 10.0 ** d
+        if np.all(np.abs(scaled - np.round(scaled)) < 1e-6):
+            return d
+    return None
+
+
+def _narrow(values):
+    # Return (array, jumlah desimal bila float32 lossless, selain itu None)
+    values = np.asarray(values)
+
+    if np.issubdtype(values.dtype, np.integer):
+        if len(values) == 0 or (values.min() >= _INT32.min and values.max() <= _INT32.max):
+            return values.astype(np.int32, copy=False), None
+        return values, None
+
+    if not np.issubdtype(values.dtype, np.floating) or values.dtype == np.float32:
+        return values, None
+
+    d = _decimals(values)
+    if d is None:
+        return values, None
+    narrowed = values.astype(np.float32)
+    scale = 10.0 ** d
+    if np.array_equal(
+        np.round(narrowed.astype(np.float64) * scale), np.round(values * scale), equal_nan=True
+    ):
+        return narrowed, d
+    return values, None
+
+
+def _concat_narrowed(parts):
+    arrays = [array for array, _ in parts]
+    if all(array.dtype != np.float32 for array in arrays) or all(
+        array.dtype == np.float32 for array in arrays
+    ):
+        return np.concatenate(arrays)
+
+    # Sebagian blok butuh float64: blok float32 dikembalikan ke nilai aslinya
+    # (pembagian n / 10^d dibulatkan tepat, sama dengan hasil parser CSV)
+    restored = [
+        np.round(array.astype(np.float64) * 10.0 ** d) / 10.0 ** d
+        if array.dtype == np.float32 else array
+        for array, d in parts
+    ]
+    return np.concatenate(restored)
+
+
+def downcast_lossless(values):
+    return _concat_narrowed([_narrow(values)])
+
+
+def preview_frame(df, n=5):
+    # float32 ditampilkan dengan desimal terpendeknya (59.8, bukan 59.799999)
+    head = df.head(n).copy()
+    for column in head.select_dtypes(include=np.float32).columns:
+        head[column] = [float(str(value)) for value in head[column].to_numpy()]
+    return head
+
+
+def _lean_frame(df, numeric_columns):
+    lean = {}
+    for column in df.columns:
+        if column in numeric_columns and pd.api.types.is_numeric_dtype(df[column]):
+            lean[column] = downcast_lossless(df[column].to_numpy())
+        else:
+            lean[column] = df[column].astype("category")
+    return pd.DataFrame(lean, index=df.index)
+
+
+# ======================================================
+# PEMBACAAN
+# ======================================================
+def _read_pyarrow(file, sample, numeric_columns):
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return _lean_frame(pd.read_csv(file), numeric_columns)
+
+    # Dibaca per blok: peak = hasil akhir ramping + satu blok, bukan seluruh
+    # tabel arrow float64. Tipe kolom dikunci dari sampel agar konsisten antar blok.
+    column_types = {
+        c: pa.int64() if pd.api.types.is_integer_dtype(sample[c]) else pa.float64()
+        for c in numeric_columns
+    }
+    try:
+        reader = pa_csv.open_csv(
+            file,
+            read_options=pa_csv.ReadOptions(block_size=INGEST_BLOCK_BYTES),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types)
+        )
+        parts = {name: [] for name in reader.schema.names}
+        for batch in reader:
+            for name, column in zip(batch.schema.names, batch.columns):
+                if name in numeric_columns:
+                    parts[name].append(_narrow(column.to_numpy(zero_copy_only=False)))
+                else:
+                    parts[name].append(column.to_pandas().astype("category"))
+    except pa.ArrowInvalid:
+        # Isi kolom di luar sampel tidak cocok dengan tipe hasil sampel
+        file.seek(0)
+        return _lean_frame(pd.read_csv(file), numeric_columns)
+
+    # Bagian per blok dilepas kolom demi kolom, dan DataFrame dibangun tanpa
+    # konsolidasi blok agar tidak ada salinan kedua dari hasil akhir
+    columns = {}
+    for name in list(parts):
+        column_parts = parts.pop(name)
+        if not column_parts:
+            columns[name] = sample[name].iloc[:0]
+        elif name in numeric_columns:
+            columns[name] = _concat_narrowed(column_parts)
+        else:
+            columns[name] = union_categoricals(column_parts)
+        del column_parts
+    return pd.DataFrame(columns, copy=False)
+
+
+def _read_sampled(file, numeric_columns, fraction, random_state):
+    # Peak dibatasi satu chunk + baris terpilih; downcast setelah concat agar
+    # dtype dan kategori seragam antar chunk
+    rng = np.random.default_rng(random_state)
+    parts = [
+        chunk[rng.random(len(chunk)) < fraction]
+        for chunk in pd.read_csv(file, chunksize=INGEST_CHUNKSIZE)
+    ]
+    return _lean_frame(pd.concat(parts, ignore_index=True), numeric_columns)
+
+
+def _file_size(file):
+    if isinstance(file, str):
+        return os.path.getsize(file)
+    file.seek(0, 2)
+    size = file.tell()
+    file.seek(0)
+    return size
+
+
+def read_upload(file, budget_mb=DEFAULT_UPLOAD_BUDGET_MB, on_exceed="sample",
+                random_state=42):
+    size = _file_size(file)
+    sample = pd.read_csv(file, nrows=PLAN_SAMPLE_ROWS)
+    if not isinstance(file, str):
+        file.seek(0)
+
+    numeric_columns = list(sample.select_dtypes(include=np.number).columns)
+    other_columns = [c for c in sample.columns if c not in numeric_columns]
+
+    # Perkiraan jumlah baris dari panjang teks sampel
+    n_sample = max(len(sample), 1)
+    if len(sample) < PLAN_SAMPLE_ROWS:
+        est_rows = len(sample)
+    else:
+        text_bytes_per_row = len(sample.to_csv(index=False).encode()) / n_sample
+        est_rows = int(size / text_bytes_per_row)
+
+    naive_bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / n_sample
+    other_bytes_per_row = (
+        sample[other_columns].memory_usage(deep=True, index=False).sum() / n_sample
+        if other_columns else 0.0
+    )
+    peak_bytes_per_row = _NUMERIC_PEAK_BYTES * len(numeric_columns) + other_bytes_per_row
+    est_peak_mb = est_rows * peak_bytes_per_row / 2**20
+
+    if est_peak_mb <= budget_mb:
+        df = _read_pyarrow(file, sample, numeric_columns)
+        sampled = False
+    elif on_exceed == "reject":
+        raise ValueError(
+            f"Perkiraan memori {est_peak_mb:,.0f} MB melebihi batas {budget_mb:,} MB "
+            f"(±{est_rows:,} baris)."
+        )
+    else:
+        df = _read_sampled(file, numeric_columns, budget_mb / est_peak_mb, random_state)
+        sampled = True
+
+    return {
+        "df": df,
+        # Dari hasil akhir: kolom yang ternyata berisi teks di luar sampel tidak ikut
+        "numeric_columns": list(df.select_dtypes(include=np.number).columns),
+        "sampled": sampled,
+        "rows": len(df),
+        "rows_estimated": est_rows,
+        "naive_mb": naive_bytes_per_row * (est_rows if sampled else len(df)) / 2**20,
+        "lean_mb": df.memory_usage(deep=True, index=False).sum() / 2**20,
+        "estimated_peak_mb": est_peak_mb,
+    }
@@ -0,0 +1,157 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+
+from cluster_metrics import evaluate_silhouette
+
+# ======================================================
+# AUTO SEARCH k TERBAIK (MEMOIZED PER k)
+# ======================================================
+KMEANS_PARAMS = {"random_state": 42}
+
+# "serial"  : satu k per waktu di proses utama
+# "thread"  : ThreadPool, X dipakai bersama dalam satu address space
+# "process" : ProcessPool, X dibagikan lewat shared memory (tanpa pickle per task)
+SEARCH_BACKENDS = ("serial", "thread", "process")
+
+# Cache level proses: (hash X, parameter KMeans, parameter silhouette)
+#   -> {k: hasil evaluate_silhouette}
+_K_SEARCH_CACHE = OrderedDict()
+_K_SEARCH_CACHE_SIZE = 16
+_K_SEARCH_LOCK = threading.Lock()
+
+
+def array_fingerprint(X):
+    X = np.ascontiguousarray(X)
+    digest = hashlib.sha256()
+    digest.update(f"{X.shape}|{X.dtype.str}".encode())
+    digest.update(memoryview(X).cast("B"))
+    return digest.hexdigest()
+
+
+def _k_search_scores(X, kmeans_params, silhouette_params):
+    key = (
+        array_fingerprint(X),
+        tuple(sorted(kmeans_params.items())),
+        tuple(sorted(silhouette_params.items())),
+    )
+    with _K_SEARCH_LOCK:
+        scores = _K_SEARCH_CACHE.setdefault(key, {})
+        _K_SEARCH_CACHE.move_to_end(key)
+        while len(_K_SEARCH_CACHE) > _K_SEARCH_CACHE_SIZE:
+            _K_SEARCH_CACHE.popitem(last=False)
+    return scores
+
+
+# ======================================================
+# WORKER
+# ======================================================
+def _score_k(X, k, kmeans_params, silhouette_params):
+    labels = KMeans(n_clusters=k, **kmeans_params).fit_predict(X)
+    return k, evaluate_silhouette(X, labels, **silhouette_params)
+
+
+def _score_k_shared(
+    shm_name, shape, dtype, k, kmeans_params, silhouette_params, inner_threads
+):
+    from threadpoolctl import threadpool_limits
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        X = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        # Batasi thread BLAS/OpenMP per worker agar tidak oversubscribe core
+        with threadpool_limits(limits=inner_threads):
+            result = _score_k(X, k, kmeans_params, silhouette_params)
+        del X
+        return result
+    finally:
+        shm.close()
+
+
+def _search_process(X, ks, kmeans_params, silhouette_params, n_jobs):
+    X = np.ascontiguousarray(X)
+    inner_threads = max(1, (os.cpu_count() or 1) // n_jobs)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+    try:
+        shared_X = np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)
+        shared_X[:] = X
+        # spawn, bukan fork: sesi Streamlit adalah thread dan pool OpenMP/BLAS
+        # sudah berjalan, fork proses multithread dapat membuat worker deadlock.
+        # Worker membangun X dari shared memory, jadi tidak bergantung fork.
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _score_k_shared, shm.name, X.shape, X.dtype.str,
+                    k, kmeans_params, silhouette_params, inner_threads
+                )
+                for k in ks
+            ]
+            results = [f.result() for f in futures]
+        del shared_X
+        return results
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _search_thread(X, ks, kmeans_params, silhouette_params, n_jobs):
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        return list(
+            pool.map(lambda k: _score_k(X, k, kmeans_params, silhouette_params), ks)
+        )
+
+
+# ======================================================
+# API
+# ======================================================
+def auto_search_k(
+    X,
+    max_k,
+    kmeans_params=KMEANS_PARAMS,
+    backend="serial",
+    n_jobs=None,
+    silhouette_params=None,
+):
+    # Hanya k yang belum pernah dihitung untuk data yang sama yang di-fit ulang
+    silhouette_params = silhouette_params or {}
+    # Semua backend memakai layout C yang sama dengan salinan shared memory:
+    # urutan penjumlahan float (dan hasilnya) bergantung pada layout memori.
+    # Hasil identik bit-per-bit selama jumlah thread BLAS/OpenMP per k sama;
+    # bila berbeda (serial memakai semua core, worker proses dibatasi),
+    # silhouette dapat berselisih pada orde 1e-16.
+    X = np.ascontiguousarray(X)
+    scores = _k_search_scores(X, kmeans_params, silhouette_params)
+    missing = [k for k in range(2, max_k + 1) if k not in scores]
+
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Backend pencarian k tidak dikenal: {backend}")
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(missing) or 1)
+
+    if backend == "serial" or n_jobs == 1 or len(missing) < 2:
+        results = [_score_k(X, k, kmeans_params, silhouette_params) for k in missing]
+    elif backend == "thread":
+        results = _search_thread(X, missing, kmeans_params, silhouette_params, n_jobs)
+    else:
+        results = _search_process(X, missing, kmeans_params, silhouette_params, n_jobs)
+
+    scores.update(results)
+
+    records = [
+        (k, scores[k]["score"], scores[k]["ci_low"], scores[k]["ci_high"])
+        for k in range(2, max_k + 1)
+    ]
+    return pd.DataFrame(
+        records, columns=["k", "Silhouette Score", "CI 95% Bawah", "CI 95% Atas"]
+    )
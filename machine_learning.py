@@ -1,26 +1,79 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-import pickle
-
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
 
-from sklearn.cluster import (
-    KMeans, AgglomerativeClustering, DBSCAN, SpectralClustering
-)
+from sklearn.cluster import KMeans
 from sklearn.mixture import GaussianMixture
 
 from sklearn.metrics import (
-    silhouette_score,
     davies_bouldin_score,
     calinski_harabasz_score
 )
 
+from assign_index import build_assign_index
+from cluster_metrics import (
+    AUTO_EXACT_MAX_ROWS,
+    DEFAULT_SAMPLE_SIZE,
+    SILHOUETTE_MODES,
+    evaluate_silhouette,
+    resolve_mode
+)
+from compute_cache import compute_cache_stats, shared_compute
+from data_loader import stream_sha256
+from dbscan_tuning import (
+    DEFAULT_EPS,
+    DEFAULT_MIN_SAMPLES,
+    dbscan_sweep,
+    fit_dbscan,
+    k_distance_curve,
+    radius_graph,
+    suggest_eps
+)
+from ingest import (
+    DEFAULT_UPLOAD_BUDGET_MB,
+    OVER_BUDGET_ACTIONS,
+    preview_frame,
+    read_upload
+)
+from k_search import SEARCH_BACKENDS, auto_search_k
+from model_registry import save_bundle
+from pca_plot import (
+    PCA_PLOT_MODES,
+    PCA_POINT_BUDGET,
+    make_pca,
+    pca_figure
+)
+from page_state import persistent_file_uploader, state_key
+from perf import instrumented_page, perf_stage
+from precision import DEFAULT_PRECISION, PRECISION_OPTIONS, scale_features
+from scalable_clustering import fit_hierarchical, make_spectral
+from streaming import (
+    DEFAULT_CHUNKSIZE,
+    STREAM_DATA_DIR,
+    make_output_path,
+    resolve_data_path,
+    stream_assign_labels,
+    stream_fit_kmeans,
+    stream_fit_scaler
+)
+
+# Batas ukuran file hasil streaming yang masih ditawarkan sebagai unduhan
+STREAM_DOWNLOAD_LIMIT = 200 * 2**20
+
+SHARED_SOURCE_LABELS = {
+    "computed": "dihitung",
+    "cache": "dari cache bersama",
+    "waited": "menunggu sesi lain"
+}
+
+
 # ======================================================
 # MAIN FUNCTION
 # ======================================================
+@instrumented_page("machine_learning")
 def machine_learning2():
 
     # =======================
@@ -52,21 +105,70 @@ def machine_learning2():
 
     st.markdown("---")
 
+    training_mode = st.sidebar.radio(
+        "Mode Training",
+        ["In-memory", "Streaming (out-of-core)"],
+        key=state_key("ml_training_mode", "In-memory")
+    )
+
+    if training_mode == "Streaming (out-of-core)":
+        machine_learning_streaming()
+        return
+
     # ======================================================
     # UPLOAD DATA
     # ======================================================
-    uploaded_file = st.file_uploader("📤 Upload Dataset (CSV)", type=["csv"])
+    uploaded_file = persistent_file_uploader(
+        "📤 Upload Dataset (CSV)", key="ml_upload", type=["csv"]
+    )
 
     if uploaded_file is None:
         st.info("Silakan unggah file CSV untuk memulai analisis machine learning.")
         return
 
-    df = pd.read_csv(uploaded_file)
+    st.sidebar.header("📥 Pengaturan Upload")
+
+    upload_budget = st.sidebar.number_input(
+        "Batas Memori Upload (MB)",
+        min_value=16,
+        max_value=16_384,
+        step=64,
+        key=state_key("ml_upload_budget", DEFAULT_UPLOAD_BUDGET_MB),
+        help="Perkiraan puncak memori saat membaca CSV."
+    )
+    upload_action = st.sidebar.selectbox(
+        "Jika Melebihi Batas",
+        OVER_BUDGET_ACTIONS,
+        format_func=lambda x: {
+            "sample": "Ambil sampel acak",
+            "reject": "Tolak file"
+        }[x],
+        key=state_key("ml_upload_action", "sample")
+    )
+
+    with perf_stage("read_csv"):
+        uploaded_file.seek(0)
+        try:
+            upload = read_upload(uploaded_file, upload_budget, upload_action)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        df = upload["df"]
 
     st.subheader("📄 Pratinjau Dataset")
-    st.dataframe(df.head(), use_container_width=True)
+    st.dataframe(preview_frame(df), use_container_width=True)
+
+    if upload["sampled"]:
+        st.warning(
+            f"⚠️ File ±{upload['rows_estimated']:,} baris melebihi batas memori "
+            f"{upload_budget:,} MB; analisis memakai sampel acak {upload['rows']:,} baris."
+        )
+    st.caption(
+        f"Memori dataset: ±{upload['naive_mb']:.1f} MB (float64/object) → "
+        f"{upload['lean_mb']:.1f} MB (int32/float32/kategori)"
+    )
 
-    numeric_df = df.select_dtypes(include=np.number).dropna()
+    numeric_df = df[upload["numeric_columns"]].dropna()
 
     if numeric_df.shape[1] < 2:
         st.error("Dataset harus memiliki minimal dua variabel numerik.")
@@ -79,80 +181,187 @@ def machine_learning2():
 
     model_name = st.sidebar.selectbox(
         "Pilih Algoritma Klastering",
-        ["KMeans", "Agglomerative", "Gaussian Mixture", "Spectral Clustering", "DBSCAN"]
+        ["KMeans", "Agglomerative", "Gaussian Mixture", "Spectral Clustering", "DBSCAN"],
+        key=state_key("ml_model_name", "KMeans")
     )
 
+    if model_name == "DBSCAN":
+        dbscan_eps = st.sidebar.number_input(
+            "DBSCAN eps",
+            min_value=0.01,
+            step=0.05,
+            format="%.2f",
+            key=state_key("ml_dbscan_eps", DEFAULT_EPS)
+        )
+        dbscan_min_samples = st.sidebar.slider(
+            "DBSCAN min_samples",
+            2, 50,
+            key=state_key("ml_dbscan_min_samples", DEFAULT_MIN_SAMPLES)
+        )
+        dbscan_tuning = st.sidebar.checkbox(
+            "Mode Tuning DBSCAN (k-distance & sweep eps)",
+            key=state_key("ml_dbscan_tuning", False)
+        )
+
     max_k = st.sidebar.slider(
         "Maksimum Jumlah Klaster (Auto-search)",
-        2, 10, 6
+        2, 10,
+        key=state_key("ml_max_k", 6)
+    )
+
+    search_backend = st.sidebar.selectbox(
+        "Mode Pencarian k",
+        SEARCH_BACKENDS,
+        format_func=lambda b: {
+            "serial": "Serial (1 core)",
+            "thread": "Paralel (thread)",
+            "process": "Paralel (proses)"
+        }[b],
+        key=state_key("ml_search_backend", "serial")
+    )
+
+    search_jobs = st.sidebar.slider(
+        "Jumlah Worker Pencarian k",
+        1, max(os.cpu_count() or 1, 2),
+        key=state_key("ml_search_jobs", os.cpu_count() or 1),
+        disabled=search_backend == "serial"
+    )
+
+    silhouette_mode = st.sidebar.selectbox(
+        "Mode Evaluasi Silhouette",
+        SILHOUETTE_MODES,
+        format_func=lambda m: {
+            "auto": f"Auto (exact ≤ {AUTO_EXACT_MAX_ROWS:,} baris)",
+            "exact": "Exact",
+            "chunked": "Exact (chunked, memori terbatas)",
+            "sampled": "Sampel terstratifikasi + CI 95%"
+        }[m],
+        key=state_key("ml_silhouette_mode", "auto")
+    )
+
+    silhouette_sample = st.sidebar.slider(
+        "Ukuran Sampel Silhouette",
+        1_000, 50_000,
+        step=1_000,
+        key=state_key("ml_silhouette_sample", DEFAULT_SAMPLE_SIZE),
+        disabled=silhouette_mode in ("exact", "chunked")
+    )
+
+    silhouette_params = {"mode": silhouette_mode, "sample_size": silhouette_sample}
+
+    pca_plot_mode = st.sidebar.selectbox(
+        "Mode Plot PCA",
+        PCA_PLOT_MODES,
+        format_func=lambda m: {
+            "auto": "Auto (densitas di atas batas titik)",
+            "scatter": "Scatter (semua titik)",
+            "density": "Densitas (histogram 2D per klaster)",
+            "sampled": "Sampel terstratifikasi"
+        }[m],
+        key=state_key("ml_pca_plot_mode", "auto")
+    )
+
+    pca_point_budget = st.sidebar.number_input(
+        "Batas Titik Plot PCA",
+        min_value=1_000,
+        step=10_000,
+        key=state_key("ml_pca_point_budget", PCA_POINT_BUDGET),
+        disabled=pca_plot_mode in ("scatter", "density")
+    )
+
+    precision = st.sidebar.selectbox(
+        "Presisi Numerik",
+        PRECISION_OPTIONS,
+        format_func=lambda x: {
+            "float64": "float64 (default)",
+            "float32": "float32 (hemat memori)"
+        }[x],
+        key=state_key("ml_precision", DEFAULT_PRECISION),
+        help="Presisi matriks terskala, centroid, PCA, dan model tersimpan."
     )
 
     # ======================================================
-    # SCALING
+    # KOMPUTASI BERSAMA ANTAR SESI
     # ======================================================
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(numeric_df)
+    # Upload identik dengan pengaturan yang sama memakai hasil yang sudah (atau
+    # sedang) dihitung sesi lain. Backend dan jumlah worker pencarian k tidak
+    # mengubah hasil sehingga tidak ikut kunci.
+    with perf_stage("upload_hash"):
+        upload_key = (
+            upload_sha256(uploaded_file),
+            upload_budget if upload["sampled"] else None,
+            precision
+        )
+    silhouette_key = tuple(sorted(silhouette_params.items()))
 
     # ======================================================
-    # AUTO SEARCH k TERBAIK
+    # SCALING + AUTO SEARCH k TERBAIK
     # ======================================================
-    def auto_search_k(X, max_k):
-        records = []
-        for k in range(2, max_k + 1):
-            labels = KMeans(n_clusters=k, random_state=42).fit_predict(X)
-            score = silhouette_score(X, labels)
-            records.append((k, score))
-        return pd.DataFrame(records, columns=["k", "Silhouette Score"])
-
-    auto_k_df = auto_search_k(X_scaled, max_k)
-    best_k = auto_k_df.loc[auto_k_df["Silhouette Score"].idxmax(), "k"]
+    prepared, prepared_source = shared_compute(
+        upload_key + ("prepare", max_k, silhouette_key),
+        lambda: prepare_features(
+            numeric_df, precision, max_k, search_backend, search_jobs, silhouette_params
+        )
+    )
+    scaler, X_scaled = prepared["scaler"], prepared["X_scaled"]
+    auto_k_df, best_k = prepared["auto_k_df"], prepared["best_k"]
 
     st.sidebar.success(f"Jumlah klaster optimal: {best_k}")
+    st.sidebar.caption(
+        f"Matriks terskala {precision}: {X_scaled.nbytes / 2**20:,.2f} MB"
+    )
 
     st.subheader("📊 Pencarian Jumlah Klaster Optimal")
     st.dataframe(auto_k_df, use_container_width=True)
 
     # ======================================================
-    # TRAIN MODEL
+    # TRAIN MODEL + EVALUASI + PCA
     # ======================================================
-    if model_name == "KMeans":
-        model = KMeans(n_clusters=best_k, random_state=42)
-        labels = model.fit_predict(X_scaled)
-        centroids = model.cluster_centers_
-
-    elif model_name == "Agglomerative":
-        model = AgglomerativeClustering(n_clusters=best_k)
-        labels = model.fit_predict(X_scaled)
-        centroids = None
-
-    elif model_name == "Gaussian Mixture":
-        model = GaussianMixture(n_components=best_k, random_state=42)
-        labels = model.fit_predict(X_scaled)
-        centroids = model.means_
+    graph = None
+    if model_name == "DBSCAN" and dbscan_tuning:
+        graph = dbscan_tuning_panel(X_scaled, dbscan_eps, dbscan_min_samples)
+
+    model_params = (dbscan_eps, dbscan_min_samples) if model_name == "DBSCAN" else ()
+    train_key = upload_key + ("train", model_name, max_k, model_params, silhouette_key)
+    try:
+        trained, trained_source = shared_compute(
+            train_key,
+            lambda: train_model(
+                X_scaled, model_name, best_k, model_params, silhouette_params, graph
+            )
+        )
+    except ValueError as e:
+        st.error(f"❌ {model_name} gagal dilatih: {e}")
+        return
+    model, labels, centroids = trained["model"], trained["labels"], trained["centroids"]
+    sil_result, dbi, chi = trained["silhouette"], trained["dbi"], trained["chi"]
+    pca, pca_data = trained["pca"], trained["pca_data"]
 
-    elif model_name == "Spectral Clustering":
-        model = SpectralClustering(n_clusters=best_k, random_state=42)
-        labels = model.fit_predict(X_scaled)
-        centroids = None
+    if trained["path"] is not None:
+        st.info(f"{model_name} memakai jalur {trained['path']}")
 
-    elif model_name == "DBSCAN":
-        model = DBSCAN(eps=0.7, min_samples=5)
-        labels = model.fit_predict(X_scaled)
-        centroids = None
+    cache_stats = compute_cache_stats()
+    st.caption(
+        f"Scaling + pencarian k: {SHARED_SOURCE_LABELS[prepared_source]} | "
+        f"Training + PCA: {SHARED_SOURCE_LABELS[trained_source]} | "
+        f"Cache komputasi bersama: {cache_stats['computes']} dihitung, "
+        f"{cache_stats['hits']} hit, {cache_stats['waits']} menunggu sesi lain "
+        f"(±{cache_stats['saved_s']:.1f} s dihemat), {cache_stats['entries']} entri "
+        f"({cache_stats['bytes'] / 2**20:.1f} MB)"
+    )
 
     # ======================================================
     # EVALUASI MODEL
     # ======================================================
-    if len(set(labels)) > 1:
-        sil = silhouette_score(X_scaled, labels)
-        dbi = davies_bouldin_score(X_scaled, labels)
-        chi = calinski_harabasz_score(X_scaled, labels)
-    else:
-        sil, dbi, chi = np.nan, np.nan, np.nan
-
     metric_df = pd.DataFrame({
         "Model": [model_name],
-        "Silhouette Score": [sil],
+        "Silhouette Score": [sil_result["score"]],
+        "Silhouette CI 95%": [
+            "-" if np.isnan(sil_result["ci_low"])
+            else f"[{sil_result['ci_low']:.4f}, {sil_result['ci_high']:.4f}]"
+        ],
+        "Mode Silhouette": [sil_result["mode"]],
+        "Ukuran Sampel": [sil_result["n_used"]],
         "Davies-Bouldin Index": [dbi],
         "Calinski-Harabasz Index": [chi]
     })
@@ -163,26 +372,21 @@ def machine_learning2():
     # ======================================================
     # PCA VISUALISASI
     # ======================================================
-    pca = PCA(n_components=2)
-    pca_data = pca.fit_transform(X_scaled)
-
-    pca_df = pd.DataFrame({
-        "PC1": pca_data[:, 0],
-        "PC2": pca_data[:, 1],
-        "Cluster": labels.astype(str)
-    })
-
-    fig = px.scatter(
-        pca_df,
-        x="PC1",
-        y="PC2",
-        color="Cluster",
-        template="plotly_white",
-        title=f"Visualisasi PCA – {model_name}"
+    fig, plot_mode, n_markers = pca_figure(
+        pca_data, labels,
+        title=f"Visualisasi PCA – {model_name}",
+        mode=pca_plot_mode,
+        budget=pca_point_budget
     )
 
     st.subheader("📉 Proyeksi Data Menggunakan PCA")
-    st.plotly_chart(fig, use_container_width=True)
+    with perf_stage("plotly_render"):
+        st.plotly_chart(fig, use_container_width=True)
+    if plot_mode != "scatter":
+        st.caption(
+            f"Mode plot **{plot_mode}**: {n_markers:,} marker dikirim ke browser "
+            f"untuk {len(labels):,} observasi."
+        )
 
     st.markdown("""
     Visualisasi PCA digunakan untuk mereduksi dimensi data dan menampilkan
@@ -228,27 +432,46 @@ def machine_learning2():
         "scaler": scaler,
         "pca": pca,
         "best_k": best_k,
-        "features": list(numeric_df.columns)
+        "features": list(numeric_df.columns),
+        "precision": precision
     }
 
-    model_filename = "clustering_model.pkl"
-
-    with open(model_filename, "wb") as f:
-        pickle.dump(model_package, f)
+    if trained["assign_index"] is not None:
+        model_package["assign_index"] = trained["assign_index"]
 
-    st.success("Model berhasil disimpan dalam format .pkl")
+    # Bundle yang sama tidak di-pickle dan di-hash ulang di setiap rerun sesi ini
+    saved = st.session_state.get("ml_saved_bundle")
+    if saved is not None and saved[0] == train_key:
+        version_info, written = saved[1], saved[2]
+    else:
+        with perf_stage("save_bundle"):
+            version_info, written = save_bundle(model_package)
+        st.session_state["ml_saved_bundle"] = (train_key, version_info, written)
+
+    if written:
+        st.success(
+            f"Model berhasil disimpan ke registry "
+            f"(versi {version_info['version']}, hash {version_info['hash'][:12]})"
+        )
+    else:
+        st.info(
+            f"Model identik sudah ada di registry (versi {version_info['version']}, "
+            f"hash {version_info['hash'][:12]}), penyimpanan ulang dilewati."
+        )
 
     # ======================================================
     # EXPORT CSV
     # ======================================================
     st.subheader("📥 Ekspor Hasil")
 
-    export_df = df.copy()
-    export_df["Cluster"] = labels
+    with perf_stage("csv_export"):
+        # df dibaca ulang setiap rerun, jadi kolom Cluster ditambahkan langsung
+        df["Cluster"] = labels
+        export_csv = df.to_csv(index=False)
 
     st.download_button(
         "⬇️ Unduh Data Hasil Klaster",
-        export_df.to_csv(index=False),
+        export_csv,
         file_name="hasil_clustering.csv"
     )
 
@@ -258,3 +481,372 @@ def machine_learning2():
             centroid_df.to_csv(index=False),
             file_name="centroid_clustering.csv"
         )
+
+
+def upload_sha256(uploaded_file):
+    # Hash dihitung sekali per unggahan (file_id UploadedFile), bukan per rerun;
+    # objek file tanpa file_id selalu di-hash ulang
+    file_id = getattr(uploaded_file, "file_id", None)
+    cached = st.session_state.get("ml_upload_hash")
+    if file_id is not None and cached is not None and cached[0] == file_id:
+        return cached[1]
+
+    digest = stream_sha256(uploaded_file)
+    if file_id is not None:
+        st.session_state["ml_upload_hash"] = (file_id, digest)
+    return digest
+
+
+# ======================================================
+# KOMPUTASI TANPA UI (DIPAKAI BERSAMA ANTAR SESI)
+# ======================================================
+def prepare_features(numeric_df, precision, max_k, search_backend, search_jobs,
+                     silhouette_params):
+    with perf_stage("scaling"):
+        scaler, X_scaled = scale_features(numeric_df, precision)
+
+    with perf_stage("auto_search_k"):
+        auto_k_df = auto_search_k(
+            X_scaled, max_k,
+            backend=search_backend,
+            n_jobs=search_jobs,
+            silhouette_params=silhouette_params
+        )
+    best_k = auto_k_df.loc[auto_k_df["Silhouette Score"].idxmax(), "k"]
+
+    return {"scaler": scaler, "X_scaled": X_scaled, "auto_k_df": auto_k_df, "best_k": best_k}
+
+
+def train_model(X_scaled, model_name, best_k, model_params, silhouette_params, graph=None):
+    path = None
+    with perf_stage(f"fit:{model_name}"):
+        if model_name == "KMeans":
+            model = KMeans(n_clusters=best_k, random_state=42)
+            labels = model.fit_predict(X_scaled)
+            centroids = model.cluster_centers_
+
+        elif model_name == "Agglomerative":
+            model, labels, path = fit_hierarchical(X_scaled, best_k)
+            centroids = None
+
+        elif model_name == "Gaussian Mixture":
+            model = GaussianMixture(n_components=best_k, random_state=42)
+            labels = model.fit_predict(X_scaled)
+            centroids = model.means_
+
+        elif model_name == "Spectral Clustering":
+            model, path = make_spectral(best_k, len(X_scaled))
+            labels = model.fit_predict(X_scaled)
+            centroids = None
+
+        elif model_name == "DBSCAN":
+            # Graf dari panel tuning hanya mempercepat fit; label tetap sama
+            dbscan_eps, dbscan_min_samples = model_params
+            model, labels = fit_dbscan(X_scaled, dbscan_eps, dbscan_min_samples, graph)
+            centroids = None
+
+    # Silhouette mengikuti mode evaluasi; DBI dan CHI linear sehingga tetap exact
+    if len(set(labels)) > 1:
+        with perf_stage("metric:silhouette"):
+            sil_result = evaluate_silhouette(X_scaled, labels, **silhouette_params)
+        with perf_stage("metric:davies_bouldin"):
+            dbi = davies_bouldin_score(X_scaled, labels)
+        with perf_stage("metric:calinski_harabasz"):
+            chi = calinski_harabasz_score(X_scaled, labels)
+    else:
+        sil_result = {
+            "score": np.nan, "mode": resolve_mode(silhouette_params["mode"], len(labels)),
+            "n_used": len(labels), "ci_low": np.nan, "ci_high": np.nan
+        }
+        dbi, chi = np.nan, np.nan
+
+    with perf_stage("pca"):
+        pca = make_pca(len(X_scaled))
+        pca_data = pca.fit_transform(X_scaled)
+
+    # Model tanpa predict/centroid membawa index tetangga untuk data baru
+    assign_index = None
+    if not hasattr(model, "predict") and centroids is None:
+        with perf_stage("assign_index"):
+            assign_index = build_assign_index(model, X_scaled, labels)
+
+    return {
+        "model": model, "labels": labels, "centroids": centroids, "path": path,
+        "silhouette": sil_result, "dbi": dbi, "chi": chi,
+        "pca": pca, "pca_data": pca_data, "assign_index": assign_index
+    }
+
+
+# ======================================================
+# TUNING DBSCAN
+# ======================================================
+def dbscan_tuning_panel(X_scaled, eps, min_samples):
+
+    st.subheader("🔧 Tuning DBSCAN")
+
+    # ======================================================
+    # K-DISTANCE
+    # ======================================================
+    k_dist = k_distance_curve(X_scaled, min_samples)
+    eps_suggest = suggest_eps(k_dist)
+
+    # Kurva di-downsample agar payload grafik tetap kecil untuk n besar
+    step = max(1, len(k_dist) // 2_000)
+    fig = px.line(
+        x=np.arange(len(k_dist))[::step],
+        y=k_dist[::step],
+        labels={"x": "Titik (terurut)", "y": f"Jarak ke tetangga ke-{min_samples}"},
+        template="plotly_white",
+        title="Kurva k-distance"
+    )
+    fig.add_hline(y=eps_suggest, line_dash="dash", annotation_text=f"eps saran {eps_suggest:.3f}")
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"eps yang disarankan (titik siku kurva): **{eps_suggest:.3f}**")
+
+    # ======================================================
+    # SWEEP EPS PADA GRAF RADIUS YANG SAMA
+    # ======================================================
+    upper = round(max(eps, eps_suggest, 0.05) * 2, 2)
+    range_key = state_key(
+        "ml_dbscan_sweep_range",
+        (
+            max(0.01, round(eps_suggest / 2, 2)),
+            max(0.02, round(min(eps_suggest * 1.5, upper), 2))
+        )
+    )
+    # Rentang tersimpan dijepit ke batas slider (data/eps lain mengubah batas atas)
+    low, high = st.session_state[range_key]
+    low = min(max(low, 0.01), upper)
+    st.session_state[range_key] = (low, min(max(high, low), upper))
+
+    eps_range = st.slider(
+        "Rentang sweep eps",
+        0.01, upper,
+        step=0.01,
+        key=range_key
+    )
+    n_steps = st.slider(
+        "Jumlah langkah sweep",
+        2, 30,
+        key=state_key("ml_dbscan_sweep_steps", 10)
+    )
+
+    max_eps = max(eps_range[1], eps)
+    graph = radius_graph(X_scaled, max_eps)
+    st.caption(
+        f"Graf radius-neighbours dihitung sekali pada eps = {max_eps:.2f} "
+        f"({graph.nnz:,} sisi) dan dipakai ulang untuk setiap langkah sweep."
+    )
+
+    sweep_df = pd.DataFrame(
+        dbscan_sweep(graph, np.linspace(eps_range[0], eps_range[1], n_steps), min_samples)
+    )
+    st.dataframe(sweep_df, use_container_width=True)
+
+    return graph
+
+
+# ======================================================
+# MODE STREAMING (OUT-OF-CORE)
+# ======================================================
+def machine_learning_streaming():
+
+    st.subheader("🌊 Training Streaming (Out-of-core)")
+    st.caption(
+        "CSV dibaca per chunk: StandardScaler dan MiniBatchKMeans dilatih "
+        "dengan partial_fit, lalu label diekspor pada pass terpisah."
+    )
+
+    # ======================================================
+    # SUMBER DATA
+    # ======================================================
+    source_type = st.radio(
+        "Sumber Data",
+        ["Path file di server", "Upload CSV"],
+        horizontal=True,
+        key=state_key("ml_stream_source", "Path file di server")
+    )
+
+    if source_type == "Path file di server":
+        data_path = st.text_input(
+            f"Path CSV relatif terhadap direktori data `{STREAM_DATA_DIR}` "
+            "(untuk file berukuran GB)",
+            key=state_key("ml_stream_path", "")
+        )
+        if not data_path:
+            st.info("Masukkan path file CSV di server untuk memulai.")
+            return
+        try:
+            source = resolve_data_path(data_path)
+        except ValueError:
+            st.error("❌ Hanya file di dalam direktori data yang dapat dipakai.")
+            return
+        except FileNotFoundError:
+            st.error("❌ File tidak ditemukan di direktori data.")
+            return
+    else:
+        source = persistent_file_uploader(
+            "📤 Upload Dataset (CSV)", key="ml_stream_upload", type=["csv"]
+        )
+        if source is None:
+            st.info("Silakan unggah file CSV untuk memulai analisis machine learning.")
+            return
+
+    # ======================================================
+    # SIDEBAR SETTINGS
+    # ======================================================
+    st.sidebar.header("⚙️ Pengaturan Streaming")
+
+    max_k = st.sidebar.slider(
+        "Maksimum Jumlah Klaster (Auto-search pada sampel)",
+        2, 10,
+        key=state_key("ml_stream_max_k", 6)
+    )
+
+    chunksize = st.sidebar.number_input(
+        "Ukuran Chunk (baris)",
+        min_value=1_000,
+        step=10_000,
+        key=state_key("ml_stream_chunksize", DEFAULT_CHUNKSIZE)
+    )
+
+    n_epochs = st.sidebar.slider(
+        "Jumlah Epoch MiniBatchKMeans",
+        1, 5,
+        key=state_key("ml_stream_epochs", 1)
+    )
+
+    source_id = source if isinstance(source, str) else source.name
+
+    if not st.button("🚀 Jalankan Training Streaming"):
+        result = st.session_state.get("ml_stream_result")
+        if result is None or result["source_id"] != source_id:
+            return
+    else:
+        # ======================================================
+        # PASS 1: SCALER + SAMPEL
+        # ======================================================
+        out_path = None
+        try:
+            with st.spinner("Pass 1/3: menghitung statistik scaling..."):
+                with perf_stage("stream:pass1_scaler"):
+                    scaler, features, sample, n_rows = stream_fit_scaler(source, chunksize)
+
+            if len(features) < 2:
+                st.error("Dataset harus memiliki minimal dua variabel numerik.")
+                return
+
+            X_sample = scaler.transform(sample)
+            with perf_stage("auto_search_k"):
+                auto_k_df = auto_search_k(X_sample, max_k)
+            best_k = int(auto_k_df.loc[auto_k_df["Silhouette Score"].idxmax(), "k"])
+
+            # ======================================================
+            # PASS 2: MINIBATCH KMEANS
+            # ======================================================
+            with st.spinner("Pass 2/3: melatih MiniBatchKMeans..."):
+                with perf_stage("stream:pass2_fit"):
+                    model = stream_fit_kmeans(
+                        source, scaler, features, best_k, chunksize, n_epochs
+                    )
+
+            # ======================================================
+            # PASS 3: LABEL + EKSPOR
+            # ======================================================
+            # File hasil run sebelumnya milik sesi ini tidak dipakai lagi
+            previous = st.session_state.get("ml_stream_result")
+            if previous is not None and os.path.exists(previous["out_path"]):
+                os.remove(previous["out_path"])
+            out_path = make_output_path()
+
+            with st.spinner("Pass 3/3: menugaskan label dan mengekspor hasil..."):
+                with perf_stage("stream:pass3_assign"):
+                    counts = stream_assign_labels(
+                        source, scaler, model, features, out_path, chunksize
+                    )
+        except (ValueError, pd.errors.ParserError) as e:
+            if out_path is not None and os.path.exists(out_path):
+                os.remove(out_path)
+            st.error(f"❌ File tidak dapat diproses: {e}")
+            return
+
+        pca = make_pca(len(X_sample)).fit(X_sample)
+
+        model_package = {
+            "model_name": "MiniBatchKMeans",
+            "model": model,
+            "scaler": scaler,
+            "pca": pca,
+            "best_k": best_k,
+            "features": features
+        }
+
+        with perf_stage("save_bundle"):
+            version_info, _ = save_bundle(model_package)
+
+        result = {
+            "source_id": source_id,
+            "n_rows": n_rows,
+            "features": features,
+            "auto_k_df": auto_k_df,
+            "best_k": best_k,
+            "counts": counts,
+            "sample_labels": model.predict(X_sample),
+            "pca_sample": pca.transform(X_sample),
+            "centroids": model.cluster_centers_,
+            "version_info": version_info,
+            "out_path": out_path
+        }
+        st.session_state["ml_stream_result"] = result
+
+    # ======================================================
+    # HASIL
+    # ======================================================
+    st.success(
+        f"Training selesai pada {result['n_rows']:,} baris lengkap "
+        f"(k = {result['best_k']}). Model disimpan ke registry "
+        f"(versi {result['version_info']['version']}, "
+        f"hash {result['version_info']['hash'][:12]})"
+    )
+
+    st.subheader("📊 Pencarian Jumlah Klaster Optimal (Sampel)")
+    st.dataframe(result["auto_k_df"], use_container_width=True)
+
+    st.subheader("🧾 Jumlah Observasi per Klaster")
+    st.dataframe(
+        pd.DataFrame(
+            {"Cluster": list(result["counts"]), "Jumlah": list(result["counts"].values())}
+        ),
+        use_container_width=True
+    )
+
+    n_sample = len(result["sample_labels"])
+    fig, _, _ = pca_figure(
+        result["pca_sample"], result["sample_labels"],
+        title=f"Visualisasi PCA – MiniBatchKMeans (sampel {n_sample:,} baris)"
+    )
+    st.subheader("📉 Proyeksi Data Menggunakan PCA")
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("🎯 Nilai Centroid Klaster")
+    centroid_df = pd.DataFrame(result["centroids"], columns=result["features"])
+    centroid_df["Cluster"] = centroid_df.index
+    st.dataframe(centroid_df, use_container_width=True)
+
+    # ======================================================
+    # EXPORT CSV
+    # ======================================================
+    st.subheader("📥 Ekspor Hasil")
+    if not os.path.exists(result["out_path"]):
+        st.warning("File hasil sudah tidak tersedia; jalankan ulang training.")
+        return
+    st.write(f"Hasil klaster ditulis ke: `{result['out_path']}`")
+
+    # File hasil besar tidak dimuat ke memori untuk tombol unduh
+    if os.path.getsize(result["out_path"]) <= STREAM_DOWNLOAD_LIMIT:
+        with open(result["out_path"], "rb") as f:
+            st.download_button(
+                "⬇️ Unduh Data Hasil Klaster",
+                f,
+                file_name="hasil_clustering.csv"
+            )
@@ -0,0 +1,231 @@
+import copy
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+import joblib
+
+from data_loader import file_sha256
+
+# ======================================================
+# REGISTRY MODEL (CONTENT-ADDRESSED)
+# ======================================================
+# model_registry/
+#   <sha256>.joblib  : artefak bundle, nama file = hash isi
+#   LATEST           : pointer JSON kecil ke versi aktif
+#   history.jsonl    : satu baris per versi baru
+#
+# Hanya REGISTRY_KEEP_LAST artefak terbaru yang disimpan (artefak LATEST
+# tidak pernah dihapus); entri history artefak yang dihapus tetap ada.
+REGISTRY_DIR = "model_registry"
+LEGACY_MODEL_PATH = "clustering_model.pkl"
+REGISTRY_KEEP_LAST = 10
+
+# Atribut hasil training yang tidak dipakai saat scoring tetapi berukuran
+# sebesar data training (affinity_matrix_ Spectral dense: n x n)
+TRAINING_ONLY_ATTRIBUTES = ("affinity_matrix_", "labels_")
+
+LATEST_FILE = "LATEST"
+HISTORY_FILE = "history.jsonl"
+
+# Cache bundle level proses, dipakai bersama oleh seluruh sesi Streamlit
+_BUNDLE_CACHE = {"path": None, "stat": None, "hash": None, "bundle": None}
+_BUNDLE_STATS = {"hits": 0, "misses": 0, "last_load_ms": None}
+_BUNDLE_LOCK = threading.Lock()
+_REGISTRY_LOCK = threading.Lock()
+
+
+class _HashWriter:
+    # File-like untuk pickle.dump: hash dihitung tanpa menyimpan byte di memori
+    def __init__(self):
+        self.digest = hashlib.sha256()
+
+    def write(self, data):
+        # Protokol 5 dapat mengirim PickleBuffer (array besar) tanpa salinan
+        view = memoryview(data)
+        self.digest.update(view)
+        return view.nbytes
+
+
+def bundle_hash(bundle):
+    writer = _HashWriter()
+    pickle.dump(bundle, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    return writer.digest.hexdigest()
+
+
+def _temp_file(path):
+    # Nama unik per pemanggilan: sesi Streamlit adalah thread dalam satu proses
+    # sehingga PID saja tidak cukup membedakan penulis
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    return fd, tmp_path
+
+
+def _atomic_write_text(path, text):
+    fd, tmp_path = _temp_file(path)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def read_latest(registry_dir=REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, LATEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# ======================================================
+# SIMPAN
+# ======================================================
+def _strip_training_state(bundle):
+    # Salinan dangkal: model yang sama masih dipakai cache komputasi bersama
+    model = bundle.get("model")
+    drop = [a for a in TRAINING_ONLY_ATTRIBUTES if hasattr(model, a)]
+    if not drop:
+        return bundle
+    model = copy.copy(model)
+    for attribute in drop:
+        delattr(model, attribute)
+    return {**bundle, "model": model}
+
+
+def save_bundle(bundle, registry_dir=REGISTRY_DIR, keep_last=REGISTRY_KEEP_LAST):
+    # Return (info versi, True bila artefak baru ditulis)
+    os.makedirs(registry_dir, exist_ok=True)
+
+    bundle = _strip_training_state(bundle)
+    digest = bundle_hash(bundle)
+    # Nomor versi (jumlah baris history) dan pointer LATEST diperbarui
+    # secara berurutan oleh satu thread
+    with _REGISTRY_LOCK:
+        info, written = _save_hashed(bundle, digest, registry_dir)
+        _prune(registry_dir, keep_last, info["file"])
+    return info, written
+
+
+def _prune(registry_dir, keep_last, latest_file):
+    # Dipanggil dengan _REGISTRY_LOCK terkunci; urutan menurut mtime
+    # (artefak yang diaktifkan kembali di-touch oleh _save_hashed)
+    artifacts = sorted(
+        (e for e in os.scandir(registry_dir) if e.is_file() and e.name.endswith(".joblib")),
+        key=lambda e: e.stat().st_mtime_ns,
+        reverse=True
+    )
+    for entry in artifacts[keep_last:]:
+        if entry.name == latest_file:
+            continue
+        try:
+            os.remove(entry.path)
+        except OSError:
+            # Mis. masih di-memory-map pembaca di Windows; dicoba lagi lain kali
+            pass
+
+
+def _save_hashed(bundle, digest, registry_dir):
+    artifact = f"{digest}.joblib"
+    artifact_path = os.path.join(registry_dir, artifact)
+    written = not os.path.exists(artifact_path)
+
+    latest = read_latest(registry_dir)
+    if latest is not None and latest["hash"] == digest and not written:
+        os.utime(artifact_path)
+        return latest, False
+
+    if written:
+        # Tulis ke file sementara lalu rename: pembaca tidak pernah melihat file setengah jadi
+        fd, tmp_path = _temp_file(artifact_path)
+        with os.fdopen(fd, "wb") as f:
+            joblib.dump(bundle, f)
+        os.replace(tmp_path, artifact_path)
+
+    history_path = os.path.join(registry_dir, HISTORY_FILE)
+    info = {
+        "hash": digest,
+        "file": artifact,
+        "model_name": bundle.get("model_name"),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    if written:
+        version = 1
+        if os.path.exists(history_path):
+            with open(history_path, encoding="utf-8") as f:
+                version += sum(1 for _ in f)
+        info["version"] = version
+        with open(history_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(info) + "\n")
+    else:
+        # Artefak lama diaktifkan kembali: pakai nomor versi dari history
+        os.utime(artifact_path)
+        info["version"] = None
+        if os.path.exists(history_path):
+            with open(history_path, encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["hash"] == digest:
+                        info["version"] = entry["version"]
+
+    _atomic_write_text(os.path.join(registry_dir, LATEST_FILE), json.dumps(info))
+    return info, written
+
+
+# ======================================================
+# LOAD
+# ======================================================
+def latest_model_path(registry_dir=REGISTRY_DIR):
+    latest = read_latest(registry_dir)
+    if latest is not None:
+        return os.path.join(registry_dir, latest["file"])
+    if os.path.exists(LEGACY_MODEL_PATH):
+        return LEGACY_MODEL_PATH
+    raise FileNotFoundError("Belum ada model tersimpan di registry.")
+
+
+def load_bundle(path):
+    if path.endswith(".joblib"):
+        # Array numpy besar di-memory-map, tidak disalin ke RAM
+        return joblib.load(path, mmap_mode="r")
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# ======================================================
+# CACHE BUNDLE (SEKALI LOAD PER PROSES)
+# ======================================================
+def cached_latest_bundle(registry_dir=REGISTRY_DIR):
+    path = os.path.abspath(latest_model_path(registry_dir))
+    stat_ = os.stat(path)
+    stat = (stat_.st_mtime_ns, stat_.st_size)
+
+    with _BUNDLE_LOCK:
+        cache = _BUNDLE_CACHE
+        if cache["path"] == path and cache["stat"] == stat:
+            _BUNDLE_STATS["hits"] += 1
+            return cache["bundle"]
+
+        # mtime berubah (mis. file di-touch): bandingkan hash sebelum unpickle ulang
+        digest = file_sha256(path)
+        if cache["path"] == path and cache["hash"] == digest:
+            cache["stat"] = stat
+            _BUNDLE_STATS["hits"] += 1
+            return cache["bundle"]
+
+        _BUNDLE_STATS["misses"] += 1
+        start = time.perf_counter()
+        bundle = load_bundle(path)
+        _BUNDLE_STATS["last_load_ms"] = (time.perf_counter() - start) * 1000
+
+        cache.update(path=path, stat=stat, hash=digest, bundle=bundle)
+        return bundle
+
+
+def bundle_cache_stats():
+    with _BUNDLE_LOCK:
+        return dict(_BUNDLE_STATS, path=_BUNDLE_CACHE["path"])
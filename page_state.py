@@ -0,0 +1,52 @@
+import streamlit as st
+
+# ======================================================
+# STATE WIDGET LINTAS HALAMAN
+# ======================================================
+# Streamlit menghapus state widget yang tidak dirender pada suatu rerun.
+# Dalam mode halaman lazy hanya satu halaman yang dirender, sehingga
+# widget berkunci dengan prefix ini ditulis ulang ke session_state
+# di awal setiap rerun agar nilainya tetap ada saat berpindah halaman.
+PERSIST_PREFIX = "ps_"
+
+
+def persist_widget_state():
+    for key in list(st.session_state.keys()):
+        if isinstance(key, str) and key.startswith(PERSIST_PREFIX):
+            st.session_state[key] = st.session_state[key]
+
+
+def state_key(name, default):
+    # Nilai awal diisi lewat session_state (bukan argumen default widget)
+    # agar Streamlit tidak memperingatkan konflik nilai default
+    key = f"{PERSIST_PREFIX}{name}"
+    if key not in st.session_state:
+        st.session_state[key] = default
+    return key
+
+
+def persistent_file_uploader(label, key, **kwargs):
+    # file_uploader tidak bisa diisi lewat session_state, jadi file terakhir
+    # disimpan terpisah dan dipakai lagi saat kembali ke halaman
+    stored_key = f"{key}_last_file"
+    restored_key = f"{key}_restored"
+    rendered_before = key in st.session_state
+
+    uploaded = st.file_uploader(label, key=key, **kwargs)
+
+    if uploaded is not None:
+        st.session_state[stored_key] = uploaded
+        st.session_state[restored_key] = False
+        return uploaded
+
+    if rendered_before and not st.session_state.get(restored_key):
+        # Uploader tetap tampil namun kosong: file memang dihapus pengguna
+        st.session_state.pop(stored_key, None)
+        return None
+
+    stored = st.session_state.get(stored_key)
+    if stored is not None:
+        st.session_state[restored_key] = True
+        st.caption(f"📎 Menggunakan file sebelumnya: {stored.name}")
+        stored.seek(0)
+    return stored
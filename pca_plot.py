@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import sklearn
+from sklearn.decomposition import PCA
+
+from cluster_metrics import stratified_sample_index
+
+# ======================================================
+# PROYEKSI PCA UNTUK DATA BESAR
+# ======================================================
+# Di atas PCA_POINT_BUDGET titik, plot tidak lagi mengirim satu marker per
+# observasi ke browser:
+# "density" : histogram 2D per klaster dihitung di server; satu marker per
+#             bin terisi, ukurannya sebanding dengan jumlah titik di bin itu
+# "sampled" : sampel terstratifikasi per klaster sebanyak budget titik
+PCA_PLOT_MODES = ("auto", "scatter", "density", "sampled")
+PCA_POINT_BUDGET = 50_000
+PCA_DENSITY_BINS = 80
+
+# n >> jumlah fitur: eigen-dekomposisi matriks kovarians (p x p) jauh lebih
+# cepat daripada SVD penuh; scikit-learn lama memakai randomized SVD
+PCA_LARGE_MIN_ROWS = 100_000
+_HAS_COVARIANCE_EIGH = tuple(int(v) for v in sklearn.__version__.split(".")[:2]) >= (1, 5)
+
+
+def make_pca(n_rows, n_components=2):
+    if n_rows < PCA_LARGE_MIN_ROWS:
+        return PCA(n_components=n_components)
+    if _HAS_COVARIANCE_EIGH:
+        return PCA(n_components=n_components, svd_solver="covariance_eigh")
+    return PCA(n_components=n_components, svd_solver="randomized", random_state=42)
+
+
+def resolve_plot_mode(mode, n_points, budget=PCA_POINT_BUDGET):
+    if mode == "auto":
+        return "scatter" if n_points <= budget else "density"
+    return mode
+
+
+def _density_frame(pca_data, labels, bins):
+    # Tepi bin dipakai bersama oleh semua klaster agar posisi marker sebanding
+    x_edges = np.histogram_bin_edges(pca_data[:, 0], bins=bins)
+    y_edges = np.histogram_bin_edges(pca_data[:, 1], bins=bins)
+    x_mid = (x_edges[:-1] + x_edges[1:]) / 2
+    y_mid = (y_edges[:-1] + y_edges[1:]) / 2
+
+    frames = []
+    for cluster in np.unique(labels):
+        mask = labels == cluster
+        counts, _, _ = np.histogram2d(
+            pca_data[mask, 0], pca_data[mask, 1], bins=[x_edges, y_edges]
+        )
+        ix, iy = np.nonzero(counts)
+        frames.append(pd.DataFrame({
+            "PC1": x_mid[ix],
+            "PC2": y_mid[iy],
+            "Cluster": str(cluster),
+            "Jumlah": counts[ix, iy].astype(int)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def pca_figure(pca_data, labels, title, mode="auto", budget=PCA_POINT_BUDGET,
+               bins=PCA_DENSITY_BINS):
+    # Return (figure, mode terpakai, jumlah marker yang dikirim ke browser)
+    labels = np.asarray(labels)
+    mode = resolve_plot_mode(mode, len(labels), budget)
+
+    if mode == "density":
+        density_df = _density_frame(pca_data, labels, bins)
+        fig = px.scatter(
+            density_df,
+            x="PC1",
+            y="PC2",
+            color="Cluster",
+            size="Jumlah",
+            size_max=18,
+            hover_data={"Jumlah": True},
+            template="plotly_white",
+            title=f"{title} (densitas {bins}×{bins} bin, {len(labels):,} titik)"
+        )
+        return fig, mode, len(density_df)
+
+    index = np.arange(len(labels))
+    if mode == "sampled":
+        index = stratified_sample_index(labels, budget)
+        title = f"{title} (sampel {len(index):,} dari {len(labels):,} titik)"
+
+    pca_df = pd.DataFrame({
+        "PC1": pca_data[index, 0],
+        "PC2": pca_data[index, 1],
+        "Cluster": labels[index].astype(str)
+    })
+    fig = px.scatter(
+        pca_df,
+        x="PC1",
+        y="PC2",
+        color="Cluster",
+        template="plotly_white",
+        title=title
+    )
+    return fig, mode, len(pca_df)
@@ -0,0 +1,168 @@
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import streamlit as st
+
+# ======================================================
+# INSTRUMENTASI PERFORMA PER TAHAP
+# ======================================================
+# @instrumented_page membungkus fungsi halaman: setiap blok
+# `with perf_stage("nama"):` dicatat (waktu + delta RSS), ditampilkan di
+# panel "Performa" dan dikirim sebagai baris log JSON (logger dashboard.perf).
+# cProfile opsional diaktifkan dari panel untuk rerun berikutnya,
+# atau selalu aktif lewat DASHBOARD_PROFILE=1.
+PROFILE_TOP_N = 25
+
+logger = logging.getLogger("dashboard.perf")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_current = contextvars.ContextVar("perf_recorder", default=None)
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Python >= 3.12: cProfile memakai satu tool id sys.monitoring per proses,
+# jadi hanya satu sesi yang boleh diprofil pada satu waktu
+_PROFILE_LOCK = threading.Lock()
+
+
+def current_rss_mb():
+    # RSS saat ini dari /proc (Linux); selain Linux pakai peak RSS sebagai pendekatan
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2**20
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        # Windows: modul resource tidak tersedia
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def log_event(record):
+    logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+@contextmanager
+def perf_stage(name):
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record = {
+            "event": "stage",
+            "run_id": recorder["run_id"],
+            "page": recorder["page"],
+            "stage": name,
+            "ms": (time.perf_counter() - start) * 1000,
+            "rss_delta_mb": current_rss_mb() - rss_before,
+        }
+        recorder["stages"].append(record)
+        log_event(record)
+
+
+def _render_panel(recorder, profile_text):
+    import pandas as pd
+
+    with st.expander("⏱️ Performa Halaman"):
+        if recorder["stages"]:
+            stages_df = pd.DataFrame(recorder["stages"])[["stage", "ms", "rss_delta_mb"]]
+            stages_df.columns = ["Tahap", "Waktu (ms)", "Δ RSS (MB)"]
+            st.dataframe(stages_df, use_container_width=True, hide_index=True)
+        st.caption(
+            f"Total rerun: {recorder['total_ms']:.1f} ms | "
+            f"RSS: {current_rss_mb():.0f} MB | run_id {recorder['run_id']}"
+        )
+
+        st.checkbox(
+            "Aktifkan cProfile pada rerun berikutnya",
+            key=f"perf_profile_{recorder['page']}"
+        )
+        if profile_text:
+            st.code(profile_text, language="text")
+
+
+def instrumented_page(page):
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = {
+                "run_id": uuid.uuid4().hex[:12],
+                "page": page,
+                "stages": [],
+                "total_ms": 0.0,
+            }
+            token = _current.set(recorder)
+
+            profiler = None
+            profile_busy = False
+            if (
+                os.environ.get("DASHBOARD_PROFILE") == "1"
+                or st.session_state.get(f"perf_profile_{page}")
+            ):
+                if _PROFILE_LOCK.acquire(blocking=False):
+                    profiler = cProfile.Profile()
+                    try:
+                        profiler.enable()
+                    except ValueError:
+                        # Profiler lain di luar dashboard memegang tool id
+                        _PROFILE_LOCK.release()
+                        profiler, profile_busy = None, True
+                else:
+                    profile_busy = True
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder["total_ms"] = (time.perf_counter() - start) * 1000
+                _current.reset(token)
+
+                profile_text = None
+                if profiler is not None:
+                    profiler.disable()
+                    _PROFILE_LOCK.release()
+                    buffer = io.StringIO()
+                    pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(
+                        PROFILE_TOP_N
+                    )
+                    profile_text = buffer.getvalue()
+
+                log_event({
+                    "event": "page",
+                    "run_id": recorder["run_id"],
+                    "page": page,
+                    "ms": recorder["total_ms"],
+                    "stages": len(recorder["stages"]),
+                    "profiled": profiler is not None,
+                })
+                if profile_busy:
+                    profile_text = "cProfile dilewati: sesi lain sedang diprofil."
+                _render_panel(recorder, profile_text)
+
+        return wrapper
+
+    return decorator
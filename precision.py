@@ -0,0 +1,25 @@
+from sklearn.preprocessing import StandardScaler
+
+# ======================================================
+# PRESISI NUMERIK PIPELINE KLASTERING
+# ======================================================
+# "float64" : perilaku awal scikit-learn
+# "float32" : matriks terskala, centroid/means, PCA, dan data baru di
+#             scoring tetap float32 (separuh memori dan bandwidth untuk
+#             tahap berbasis jarak). Mean/varians scaler tetap diakumulasi
+#             scikit-learn dalam float64.
+PRECISION_OPTIONS = ("float64", "float32")
+DEFAULT_PRECISION = "float64"
+
+
+def scale_features(numeric_df, precision=DEFAULT_PRECISION):
+    # Return (scaler, X terskala dengan dtype sesuai presisi)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(numeric_df.astype(precision))
+    return scaler, X_scaled
+
+
+def bundle_precision(bundle):
+    # Bundle lama (sebelum opsi presisi) selalu float64
+    return bundle.get("precision", DEFAULT_PRECISION)
+
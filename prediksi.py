@@ -1,14 +1,26 @@
 import streamlit as st
 
+from model_registry import bundle_cache_stats, cached_latest_bundle
+from page_state import state_key
+from perf import instrumented_page, perf_stage
+from precision import bundle_precision
+from scoring import (
+    UnsupportedModelError,
+    assign_clusters,
+    missing_features,
+    model_centroids,
+    read_input_columns,
+    risk_label,
+    score_batch
+)
+
 # ======================================================
 # PREDIKSI KLASTERING (SINKRON DENGAN MODEL .PKL)
 # ======================================================
+@instrumented_page("prediksi")
 def app_prediksi_klaster_wilayah():
 
-    import numpy as np
     import pandas as pd
-    import pickle
-    from sklearn.metrics import pairwise_distances
 
     st.title("🌍 Prediksi Klaster Wilayah")
     st.caption("Model Clustering Tersimpan | Prediksi Data Baru")
@@ -17,18 +29,37 @@ def app_prediksi_klaster_wilayah():
     # LOAD MODEL
     # ======================================================
     try:
-        with open("clustering_model.pkl", "rb") as f:
-            bundle = pickle.load(f)
+        with perf_stage("load_model"):
+            bundle = cached_latest_bundle()
     except FileNotFoundError:
-        st.error("❌ File clustering_model.pkl tidak ditemukan.")
+        st.error("❌ Belum ada model tersimpan (registry maupun clustering_model.pkl).")
         return
 
     model = bundle["model"]
-    scaler = bundle["scaler"]
     features = bundle["features"]
     model_name = bundle["model_name"]
 
-    st.success(f"✅ Model berhasil dimuat ({model_name})")
+    st.success(f"✅ Model berhasil dimuat ({model_name}, {bundle_precision(bundle)})")
+
+    cache_stats = bundle_cache_stats()
+    st.caption(
+        f"Cache model: {cache_stats['hits']} hit | {cache_stats['misses']} miss | "
+        f"load terakhir {cache_stats['last_load_ms']:.1f} ms"
+    )
+
+    # ======================================================
+    # MODE PREDIKSI
+    # ======================================================
+    mode = st.radio(
+        "Mode Prediksi",
+        ["Input Manual", "Batch (Upload File)"],
+        horizontal=True,
+        key=state_key("pred_mode", "Input Manual")
+    )
+
+    if mode == "Batch (Upload File)":
+        prediksi_batch(bundle)
+        return
 
     # ======================================================
     # INPUT DATA
@@ -41,8 +72,8 @@ def app_prediksi_klaster_wilayah():
     for i, ftr in enumerate(features):
         input_data[ftr] = cols[i % 2].number_input(
             ftr,
-            value=0.0,
-            step=0.1
+            step=0.1,
+            key=state_key(f"pred_{ftr}", 0.0)
         )
 
     input_df = pd.DataFrame([input_data])
@@ -52,28 +83,12 @@ def app_prediksi_klaster_wilayah():
     # ======================================================
     if st.button("🔮 Prediksi Klaster"):
 
-        X_scaled = scaler.transform(input_df)
-
-        # ===============================
-        # CASE 1: MODEL SUPPORT PREDICT
-        # ===============================
-        if hasattr(model, "predict"):
-            cluster = int(model.predict(X_scaled)[0])
-
-        # ===============================
-        # CASE 2: MODEL TANPA PREDICT
-        # ===============================
-        else:
-            if hasattr(model, "cluster_centers_"):
-                centroids = model.cluster_centers_
-            elif hasattr(model, "means_"):
-                centroids = model.means_
-            else:
-                st.error("❌ Model tidak mendukung prediksi data baru.")
-                return
-
-            distances = pairwise_distances(X_scaled, centroids)
-            cluster = int(np.argmin(distances))
+        try:
+            with perf_stage("predict"):
+                cluster = int(assign_clusters(bundle, input_df)[0])
+        except UnsupportedModelError:
+            st.error("❌ Model tidak mendukung prediksi data baru.")
+            return
 
         # ======================================================
         # OUTPUT
@@ -84,12 +99,7 @@ def app_prediksi_klaster_wilayah():
         # ======================================================
         # INTERPRETASI BERBASIS CENTROID
         # ======================================================
-        if hasattr(model, "cluster_centers_"):
-            centers = model.cluster_centers_
-        elif hasattr(model, "means_"):
-            centers = model.means_
-        else:
-            centers = None
+        centers = model_centroids(model)
 
         if centers is not None:
             centers_df = pd.DataFrame(centers, columns=features)
@@ -116,15 +126,7 @@ def app_prediksi_klaster_wilayah():
         # ======================================================
         st.subheader("🧾 Ringkasan Interpretasi")
 
-        if cluster == 0:
-            label = "Klaster Risiko Rendah"
-            deskripsi = "Wilayah dengan indikator relatif stabil dan terkendali."
-        elif cluster == 1:
-            label = "Klaster Risiko Menengah"
-            deskripsi = "Wilayah dengan kondisi transisi, perlu perhatian moderat."
-        else:
-            label = "Klaster Risiko Tinggi"
-            deskripsi = "Wilayah dengan indikator dominan tinggi, perlu prioritas penanganan."
+        label, deskripsi = risk_label(cluster)
 
         st.markdown(f"### 🏷️ {label}")
         st.write(deskripsi)
@@ -142,3 +144,73 @@ def app_prediksi_klaster_wilayah():
 
         for i, r in enumerate(rekomendasi, 1):
             st.markdown(f"**{i}.** {r}")
+
+
+# ======================================================
+# PREDIKSI BATCH (CSV / PARQUET)
+# ======================================================
+def prediksi_batch(bundle):
+
+    import pandas as pd
+
+    st.subheader("📦 Prediksi Batch")
+    st.caption(
+        "Unggah file berisi banyak wilayah/tahun. Data diproses per chunk "
+        "secara tervektorisasi dan hasil berlabel dapat diunduh."
+    )
+
+    uploaded = st.file_uploader(
+        "📤 Upload Data Baru (CSV / Parquet)",
+        type=["csv", "parquet"],
+        key="pred_batch_upload"
+    )
+
+    if uploaded is None:
+        st.info("Kolom file harus memuat seluruh fitur model: " + ", ".join(bundle["features"]))
+        return
+
+    # ======================================================
+    # VALIDASI KOLOM
+    # ======================================================
+    with perf_stage("batch:validate"):
+        missing = missing_features(
+            read_input_columns(uploaded, uploaded.name), bundle["features"]
+        )
+    if missing:
+        st.error("❌ Kolom berikut tidak ditemukan pada file: " + ", ".join(missing))
+        return
+
+    if not st.button("🔮 Prediksi Klaster Batch"):
+        return
+
+    try:
+        with st.spinner("Memproses prediksi batch..."):
+            with perf_stage("batch:score"):
+                labelled_csv, counts = score_batch(bundle, uploaded, uploaded.name)
+    except UnsupportedModelError:
+        st.error("❌ Model tidak mendukung prediksi data baru.")
+        return
+    except (ValueError, TypeError) as e:
+        # Mis. nilai fitur non-numerik atau CSV rusak (ParserError)
+        st.error(f"❌ File tidak dapat diproses: {e}")
+        return
+
+    # ======================================================
+    # OUTPUT
+    # ======================================================
+    st.subheader("📊 Hasil Prediksi Batch")
+    st.dataframe(
+        pd.DataFrame({
+            "Cluster": list(counts),
+            "Label": [risk_label(c)[0] for c in counts],
+            "Jumlah": list(counts.values())
+        }),
+        use_container_width=True
+    )
+
+    st.download_button(
+        "⬇️ Unduh Hasil Prediksi",
+        labelled_csv,
+        file_name="hasil_prediksi_batch.csv",
+        mime="text/csv"
+    )
@@ -0,0 +1,46 @@
+import threading
+from collections import OrderedDict
+
+# ======================================================
+# CACHE GRAFIK TER-RENDER (LRU, DIBATASI TOTAL BYTE)
+# ======================================================
+# Kunci: (versi dataset, negara terpilih, id grafik). Nilai: bytes hasil
+# render final, yaitu JSON Vega-Lite untuk grafik Altair dan PNG untuk
+# heatmap matplotlib. Entri terlama dibuang saat total byte melebihi batas.
+RENDER_CACHE_MAX_BYTES = 64 * 2**20
+
+_RENDER_CACHE = OrderedDict()
+_RENDER_STATS = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+_RENDER_LOCK = threading.Lock()
+
+
+def selection_key(countries):
+    # Urutan pilihan multiselect tidak mengubah isi grafik
+    return None if countries is None else tuple(sorted(countries))
+
+
+def cached_render(key, render, max_bytes=RENDER_CACHE_MAX_BYTES):
+    with _RENDER_LOCK:
+        if key in _RENDER_CACHE:
+            _RENDER_CACHE.move_to_end(key)
+            _RENDER_STATS["hits"] += 1
+            return _RENDER_CACHE[key]
+        _RENDER_STATS["misses"] += 1
+
+    # Render di luar lock; dua rerun bersamaan paling buruk me-render dua kali
+    payload = render()
+
+    with _RENDER_LOCK:
+        if key not in _RENDER_CACHE and len(payload) <= max_bytes:
+            _RENDER_CACHE[key] = payload
+            _RENDER_STATS["bytes"] += len(payload)
+            while _RENDER_STATS["bytes"] > max_bytes:
+                _, evicted = _RENDER_CACHE.popitem(last=False)
+                _RENDER_STATS["bytes"] -= len(evicted)
+                _RENDER_STATS["evictions"] += 1
+    return payload
+
+
+def render_cache_stats():
+    with _RENDER_LOCK:
+        return dict(_RENDER_STATS, entries=len(_RENDER_CACHE))
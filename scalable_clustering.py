@@ -0,0 +1,97 @@
+import numpy as np
+from sklearn.cluster import AgglomerativeClustering, Birch, SpectralClustering
+
+# ======================================================
+# VARIAN ALGORITMA UNTUK DATA BESAR
+# ======================================================
+# Spectral dense (RBF) butuh matriks afinitas n x n dan eigendecomposition
+# penuh; di atas ambang ini dipakai graf kNN sparse + eigensolver iteratif.
+SPECTRAL_DENSE_MAX_ROWS = 5_000
+SPECTRAL_KNN_NEIGHBORS = 10
+
+# Agglomerative penuh butuh O(n²) memori; di atas ambang ini data dipadatkan
+# ke subklaster CF-tree BIRCH, lalu Agglomerative dijalankan pada centroidnya.
+# Threshold awal diturunkan dari sebaran data (radius bola yang membagi awan
+# data menjadi ±BIRCH_TARGET_SUBCLUSTERS bagian), lalu dinaikkan/diturunkan
+# sampai jumlah subklaster berada di antara batas bawah dan atas.
+AGGLOMERATIVE_FULL_MAX_ROWS = 10_000
+BIRCH_MIN_SUBCLUSTERS = 500
+BIRCH_TARGET_SUBCLUSTERS = 2_500
+BIRCH_MAX_SUBCLUSTERS = 5_000
+BIRCH_THRESHOLD_GROWTH = 1.25
+BIRCH_MAX_FITS = 12
+
+
+def make_spectral(n_clusters, n_rows, random_state=42):
+    # Return (model, deskripsi jalur yang dipakai)
+    if n_rows <= SPECTRAL_DENSE_MAX_ROWS:
+        model = SpectralClustering(n_clusters=n_clusters, random_state=random_state)
+        return model, f"dense RBF (n = {n_rows:,} ≤ {SPECTRAL_DENSE_MAX_ROWS:,})"
+
+    model = SpectralClustering(
+        n_clusters=n_clusters,
+        affinity="nearest_neighbors",
+        n_neighbors=SPECTRAL_KNN_NEIGHBORS,
+        eigen_solver="lobpcg",
+        random_state=random_state,
+        n_jobs=-1
+    )
+    return model, (
+        f"graf kNN sparse (n_neighbors={SPECTRAL_KNN_NEIGHBORS}) + LOBPCG "
+        f"(n = {n_rows:,} > {SPECTRAL_DENSE_MAX_ROWS:,})"
+    )
+
+
+def fit_hierarchical(X, n_clusters):
+    # Return (model, label seluruh baris, deskripsi jalur yang dipakai)
+    n_rows = len(X)
+    if n_rows <= AGGLOMERATIVE_FULL_MAX_ROWS:
+        model = AgglomerativeClustering(n_clusters=n_clusters)
+        labels = model.fit_predict(X)
+        return model, labels, f"Agglomerative penuh (n = {n_rows:,} ≤ {AGGLOMERATIVE_FULL_MAX_ROWS:,})"
+
+    min_subclusters = max(n_clusters, BIRCH_MIN_SUBCLUSTERS)
+    threshold = initial_birch_threshold(X)
+    too_few, too_many = None, None
+    for _ in range(BIRCH_MAX_FITS):
+        tree = Birch(threshold=threshold, n_clusters=None).fit(X)
+        n_subclusters = len(tree.subcluster_centers_)
+        if n_subclusters > BIRCH_MAX_SUBCLUSTERS:
+            too_many = threshold
+        elif n_subclusters < min_subclusters:
+            too_few = threshold
+        else:
+            break
+        # Geometris sampai kedua batas diketahui, setelah itu bisection
+        if too_few is not None and too_many is not None:
+            threshold = np.sqrt(too_few * too_many)
+        elif too_few is not None:
+            threshold = too_few / BIRCH_THRESHOLD_GROWTH
+        else:
+            threshold = too_many * BIRCH_THRESHOLD_GROWTH
+
+    if n_subclusters < n_clusters:
+        # Mis. data hampir konstan: subklaster tidak cukup untuk langkah global
+        raise ValueError(
+            f"BIRCH hanya menghasilkan {n_subclusters} subklaster untuk "
+            f"{n_clusters} klaster; data terlalu seragam untuk Agglomerative."
+        )
+
+    # Langkah global saja (tanpa membangun ulang tree): Agglomerative pada
+    # centroid subklaster; Birch.predict memetakan setiap baris ke subklaster terdekat
+    tree.set_params(n_clusters=AgglomerativeClustering(n_clusters=n_clusters))
+    tree.partial_fit()
+    labels = tree.predict(X)
+    return tree, labels, (
+        f"BIRCH → Agglomerative ({len(tree.subcluster_centers_):,} subklaster, "
+        f"threshold {threshold:.2f}, n = {n_rows:,} > {AGGLOMERATIVE_FULL_MAX_ROWS:,})"
+    )
+
+
+def initial_birch_threshold(X):
+    # Radius awan data ≈ akar total varians + 2 simpangan baku rata-rata;
+    # bola berjari-jari t menutupinya dengan ±(R / t)^d subklaster
+    n_features = X.shape[1]
+    spread = float(np.sqrt(np.var(X, axis=0, dtype=np.float64).sum()))
+    radius = spread * (1 + 2 / np.sqrt(n_features))
+    return max(radius * BIRCH_TARGET_SUBCLUSTERS ** (-1 / n_features), 1e-6)
@@ -0,0 +1,139 @@
+import io
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import pairwise_distances
+
+from assign_index import NOISE_LABEL, query_assign_index
+from precision import bundle_precision
+
+# ======================================================
+# PENUGASAN KLASTER UNTUK DATA BARU
+# ======================================================
+# Dipakai bersama oleh prediksi manual, prediksi batch, dan scoring_service.
+DEFAULT_BATCH_CHUNKSIZE = 50_000
+
+
+class UnsupportedModelError(Exception):
+    # Model tanpa predict, centroid, maupun index penugasan; bukan kesalahan data
+    pass
+
+
+def model_centroids(model):
+    if hasattr(model, "cluster_centers_"):
+        return model.cluster_centers_
+    if hasattr(model, "means_"):
+        return model.means_
+    return None
+
+
+def missing_features(columns, features):
+    return [f for f in features if f not in set(columns)]
+
+
+def assign_clusters_with_distance(bundle, X):
+    # X: DataFrame berisi kolom bundle["features"]
+    # Jarak (ruang terskala) ke centroid klaster terpilih; untuk model berbasis
+    # index out-of-sample, jarak ke titik training terdekat; NaN bila tidak ada
+    model = bundle["model"]
+    # Data baru mengikuti presisi training: model float32 (mis. KMeans)
+    # menolak input float64
+    X_scaled = bundle["scaler"].transform(
+        X[bundle["features"]].astype(bundle_precision(bundle))
+    )
+    centroids = model_centroids(model)
+
+    if centroids is not None:
+        distances = pairwise_distances(X_scaled, centroids)
+        if hasattr(model, "predict"):
+            labels = np.asarray(model.predict(X_scaled), dtype=int)
+        else:
+            labels = np.argmin(distances, axis=1)
+        return labels, distances[np.arange(len(labels)), labels]
+
+    if hasattr(model, "predict"):
+        labels = np.asarray(model.predict(X_scaled), dtype=int)
+        return labels, np.full(len(labels), np.nan)
+
+    if bundle.get("assign_index") is not None:
+        labels, distances = query_assign_index(bundle["assign_index"], X_scaled)
+        return np.asarray(labels, dtype=int), distances
+
+    raise UnsupportedModelError("Model tidak mendukung prediksi data baru.")
+
+
+def assign_clusters(bundle, X):
+    return assign_clusters_with_distance(bundle, X)[0]
+
+
+def risk_label(cluster):
+    if cluster == NOISE_LABEL:
+        return (
+            "Outlier (Noise)",
+            "Wilayah berada di luar jangkauan eps seluruh klaster inti DBSCAN."
+        )
+    if cluster == 0:
+        return (
+            "Klaster Risiko Rendah",
+            "Wilayah dengan indikator relatif stabil dan terkendali."
+        )
+    if cluster == 1:
+        return (
+            "Klaster Risiko Menengah",
+            "Wilayah dengan kondisi transisi, perlu perhatian moderat."
+        )
+    return (
+        "Klaster Risiko Tinggi",
+        "Wilayah dengan indikator dominan tinggi, perlu prioritas penanganan."
+    )
+
+
+# ======================================================
+# BATCH SCORING
+# ======================================================
+def iter_input_chunks(source, file_name, chunksize=DEFAULT_BATCH_CHUNKSIZE):
+    if file_name.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize)
+
+
+def read_input_columns(source, file_name):
+    if file_name.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        columns = pq.ParquetFile(source).schema_arrow.names
+    else:
+        columns = list(pd.read_csv(source, nrows=0).columns)
+    source.seek(0)
+    return columns
+
+
+def score_batch(bundle, source, file_name, chunksize=DEFAULT_BATCH_CHUNKSIZE):
+    # Return (CSV berlabel sebagai BytesIO di posisi awal, jumlah baris per klaster)
+    # Baris dengan fitur kosong diberi label <NA>. Chunk ditulis langsung
+    # sebagai bytes, tanpa string CSV utuh yang di-encode ulang.
+    features = bundle["features"]
+    out = io.BytesIO()
+    counts = {}
+    header = True
+
+    for chunk in iter_input_chunks(source, file_name, chunksize):
+        complete = chunk[features].notna().all(axis=1)
+        labels = pd.Series(pd.NA, index=chunk.index, dtype="Int64")
+
+        if complete.any():
+            assigned = assign_clusters(bundle, chunk.loc[complete])
+            labels[complete] = assigned
+            for c, n in zip(*np.unique(assigned, return_counts=True)):
+                counts[int(c)] = counts.get(int(c), 0) + int(n)
+
+        chunk["Cluster"] = labels
+        chunk.to_csv(out, index=False, header=header, encoding="utf-8")
+        header = False
+
+    out.seek(0)
+    return out, dict(sorted(counts.items()))
@@ -0,0 +1,236 @@
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from model_registry import latest_model_path, load_bundle
+from scoring import UnsupportedModelError, assign_clusters_with_distance, risk_label
+
+# ======================================================
+# LAYANAN SCORING HTTP/JSON (TANPA STREAMLIT)
+# ======================================================
+# POST /predict : satu objek fitur, atau {"rows": [objek, ...]}
+# GET  /stats   : statistik latensi, ukuran batch, dan throughput
+# GET  /health  : status layanan dan model yang dimuat
+#
+# Permintaan satu baris yang datang bersamaan digabung menjadi micro-batch
+# (maks. max_batch_size baris atau max_wait_ms) untuk satu transform + predict.
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+LATENCY_WINDOW = 10_000
+
+
+class MicroBatcher:
+
+    def __init__(self, bundle, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.bundle = bundle
+        self.features = list(bundle["features"])
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._batches = 0
+        self._batched_rows = 0
+
+        threading.Thread(target=self._run, daemon=True).start()
+
+    # ======================================================
+    # API
+    # ======================================================
+    def validate(self, record):
+        missing = [f for f in self.features if f not in record]
+        if missing:
+            raise ValueError("Fitur tidak lengkap: " + ", ".join(missing))
+        row = [float(record[f]) for f in self.features]
+        # json.loads menerima NaN/Infinity; baris seperti itu ditolak di sini
+        # agar tidak menggagalkan micro-batch milik request lain
+        invalid = [f for f, v in zip(self.features, row) if not math.isfinite(v)]
+        if invalid:
+            raise ValueError("Nilai fitur harus berhingga: " + ", ".join(invalid))
+        return row
+
+    def submit_many(self, records):
+        start = time.perf_counter()
+        items = [
+            {"row": self.validate(r), "done": threading.Event(), "start": start}
+            for r in records
+        ]
+        for item in items:
+            self._queue.put(item)
+
+        results = []
+        for item in items:
+            item["done"].wait()
+            if "error" in item:
+                raise item["error"]
+            results.append(item["result"])
+        return results
+
+    def submit(self, record):
+        return self.submit_many([record])[0]
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self._latencies_ms)
+            elapsed = time.perf_counter() - self._started
+            return {
+                "requests": self._requests,
+                "batches": self._batches,
+                "mean_batch_size": self._batched_rows / self._batches if self._batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "latency_ms": {
+                    q: float(np.percentile(latencies, p)) if len(latencies) else None
+                    for q, p in (("p50", 50), ("p95", 95), ("p99", 99))
+                },
+                "throughput_rps": self._requests / elapsed if elapsed else 0.0,
+            }
+
+    # ======================================================
+    # WORKER
+    # ======================================================
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self, batch):
+        X = pd.DataFrame([item["row"] for item in batch], columns=self.features)
+        labels, distances = assign_clusters_with_distance(self.bundle, X)
+        for item, cluster, distance in zip(batch, labels, distances):
+            label, _ = risk_label(int(cluster))
+            item["result"] = {
+                "cluster": int(cluster),
+                "distance_to_centroid": float(distance) if np.isfinite(distance) else None,
+                "risk_label": label,
+            }
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._score(batch)
+            except Exception:
+                # Batch gagal: ulangi per baris agar galat hanya sampai ke
+                # request yang menyebabkannya
+                for item in batch:
+                    try:
+                        self._score([item])
+                    except Exception as exc:
+                        item["error"] = exc
+
+            now = time.perf_counter()
+            with self._lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._batched_rows += len(batch)
+                self._latencies_ms.extend((now - item["start"]) * 1000 for item in batch)
+
+            for item in batch:
+                item["done"].set()
+
+
+# ======================================================
+# HTTP
+# ======================================================
+def make_handler(batcher, model_info):
+
+    class ScoringHandler(BaseHTTPRequestHandler):
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(200, batcher.stats())
+            elif self.path == "/health":
+                self._send_json(200, {"status": "ok", **model_info})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if isinstance(payload, dict) and "rows" in payload:
+                    self._send_json(200, {"results": batcher.submit_many(payload["rows"])})
+                else:
+                    self._send_json(200, batcher.submit(payload))
+            except (ValueError, TypeError) as exc:
+                self._send_json(400, {"error": str(exc)})
+            except UnsupportedModelError as exc:
+                self._send_json(422, {"error": str(exc)})
+            except Exception as exc:
+                self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def log_message(self, format, *args):
+            # Log akses per request dimatikan agar tidak membebani throughput
+            pass
+
+    return ScoringHandler
+
+
+def create_server(bundle, host="127.0.0.1", port=8502,
+                  max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                  model_info=None):
+    batcher = MicroBatcher(bundle, max_batch_size, max_wait_ms)
+    model_info = model_info or {"model_name": bundle.get("model_name")}
+    server = ThreadingHTTPServer((host, port), make_handler(batcher, model_info))
+    server.daemon_threads = True
+    return server, batcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan scoring klaster wilayah")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--model", default=None,
+                        help="Path bundle; default versi LATEST di registry")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    model_path = args.model or latest_model_path()
+    bundle = load_bundle(model_path)
+    server, _ = create_server(
+        bundle, args.host, args.port, args.max_batch_size, args.max_wait_ms,
+        model_info={"model_name": bundle.get("model_name"), "model_path": model_path}
+    )
+
+    print(f"Layanan scoring berjalan di http://{args.host}:{args.port} ({model_path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+
+# ======================================================
+# TRAINING OUT-OF-CORE (CSV LEBIH BESAR DARI RAM)
+# ======================================================
+# Pass 1 : deteksi fitur numerik, StandardScaler.partial_fit, sampel reservoir
+# Pass 2 : MiniBatchKMeans.partial_fit per chunk (bisa beberapa epoch)
+# Pass 3 : penugasan label per chunk dan ekspor langsung ke file
+DEFAULT_CHUNKSIZE = 50_000
+DEFAULT_RESERVOIR_SIZE = 20_000
+
+# Mode "path file di server" hanya boleh membaca CSV di bawah direktori ini
+STREAM_DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", "data")
+
+
+def resolve_data_path(path, data_dir=STREAM_DATA_DIR):
+    # Path relatif terhadap data_dir; symlink dan ".." diselesaikan dulu
+    # agar tidak bisa keluar dari direktori data
+    root = os.path.realpath(data_dir)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError("Path berada di luar direktori data.")
+    if not os.path.isfile(resolved):
+        raise FileNotFoundError(path)
+    return resolved
+
+
+def make_output_path():
+    # Satu file per run: sesi lain tidak menimpa atau membaca hasil ini
+    fd, out_path = tempfile.mkstemp(prefix="hasil_clustering_", suffix=".csv")
+    os.close(fd)
+    return out_path
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _iter_chunks(source, chunksize, usecols=None):
+    reader = pd.read_csv(_rewind(source), chunksize=chunksize, usecols=usecols)
+    for chunk in reader:
+        yield chunk
+
+
+def _numeric(chunk, features):
+    # Tipe kolom ditentukan dari chunk pertama; teks di chunk berikutnya
+    # (mis. "n/a?") menjadi NaN sehingga barisnya diperlakukan tidak lengkap
+    return chunk[features].apply(pd.to_numeric, errors="coerce")
+
+
+def _update_reservoir(reservoir, chunk, size, rng):
+    # Bottom-k sampling: setiap baris mendapat kunci acak, simpan `size` kunci terkecil
+    keyed = chunk.assign(_key=rng.random(len(chunk)))
+    if reservoir is not None:
+        keyed = pd.concat([reservoir, keyed], ignore_index=True)
+    return keyed.nsmallest(size, "_key")
+
+
+def stream_fit_scaler(source, chunksize=DEFAULT_CHUNKSIZE,
+                      reservoir_size=DEFAULT_RESERVOIR_SIZE, random_state=42):
+    rng = np.random.default_rng(random_state)
+    scaler = StandardScaler()
+    features = None
+    reservoir = None
+    n_rows = 0
+
+    for chunk in _iter_chunks(source, chunksize):
+        if features is None:
+            features = list(chunk.select_dtypes(include=np.number).columns)
+        numeric = _numeric(chunk, features).dropna()
+        if numeric.empty:
+            continue
+        scaler.partial_fit(numeric)
+        reservoir = _update_reservoir(reservoir, numeric, reservoir_size, rng)
+        n_rows += len(numeric)
+
+    if features is None or reservoir is None:
+        raise ValueError("File CSV tidak berisi baris numerik yang lengkap.")
+
+    sample = reservoir.drop(columns="_key").reset_index(drop=True)
+    return scaler, features, sample, n_rows
+
+
+def stream_fit_kmeans(source, scaler, features, n_clusters,
+                      chunksize=DEFAULT_CHUNKSIZE, n_epochs=1, random_state=42):
+    model = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        random_state=random_state,
+        batch_size=min(chunksize, 4096),
+        n_init=3
+    )
+
+    for _ in range(n_epochs):
+        for chunk in _iter_chunks(source, chunksize, usecols=features):
+            numeric = _numeric(chunk, features).dropna()
+            # partial_fit pertama butuh minimal n_clusters baris
+            if len(numeric) < n_clusters:
+                continue
+            model.partial_fit(scaler.transform(numeric))
+
+    return model
+
+
+def stream_assign_labels(source, scaler, model, features, out_path,
+                         chunksize=DEFAULT_CHUNKSIZE):
+    # Baris dengan nilai kosong pada fitur tidak diberi label (<NA>)
+    counts = {}
+    header = True
+
+    with open(out_path, "w", newline="", encoding="utf-8") as out:
+        for chunk in _iter_chunks(source, chunksize):
+            numeric = _numeric(chunk, features)
+            complete = numeric.notna().all(axis=1)
+            labels = pd.Series(pd.NA, index=chunk.index, dtype="Int64")
+
+            if complete.any():
+                predicted = model.predict(scaler.transform(numeric[complete]))
+                labels[complete] = predicted
+                for c, n in zip(*np.unique(predicted, return_counts=True)):
+                    counts[int(c)] = counts.get(int(c), 0) + int(n)
+
+            chunk["Cluster"] = labels
+            chunk.to_csv(out, index=False, header=header)
+            header = False
+
+    return dict(sorted(counts.items()))
@@ -1,9 +1,26 @@
+import io
+import json
+
 import streamlit as st
-import pandas as pd
 import altair as alt
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from aggregate_cube import cube_mean, dataset_cube, rollup
+from chart_data import (
+    CHART_ROW_BUDGET,
+    COUNT_COLUMN,
+    country_mean_data,
+    point_data,
+    trend_data
+)
+from country_stats import country_stats, stats_corr
+from data_loader import load_dataset
+from page_state import state_key
+from perf import instrumented_page, perf_stage
+from render_cache import cached_render, render_cache_stats, selection_key
+
+@instrumented_page("visualisasi")
 def visualisasi():
     # =======================
     # STYLE
@@ -43,13 +60,25 @@ def visualisasi():
     """, unsafe_allow_html=True)
 
     # ================= LOAD DATA =================
-    df = pd.read_csv("climate_change_dataset.csv")
+    with perf_stage("load_dataset"):
+        # Satu snapshot: df, versi, dan base tidak boleh berasal dari
+        # pembacaan file yang berbeda bila CSV sedang ditambah baris
+        df, version, base = load_dataset()
+
+    # Cube Country x Year melayani kartu metrik, tren, dan bar;
+    # statistik cukup per negara melayani heatmap korelasi
+    with perf_stage("aggregate_cube"):
+        cube = dataset_cube(df, version, base)
+    with perf_stage("country_stats"):
+        stats = country_stats(df, version, base=base)
 
     # ================= METRIC =================
-    avg_temp = df['Avg Temperature (°C)'].mean()
-    avg_co2 = df['CO2 Emissions (Tons/Capita)'].mean()
-    avg_sea = df['Sea Level Rise (mm)'].mean()
-    avg_extreme = df['Extreme Weather Events'].mean()
+    with perf_stage("metrics"):
+        global_mean = cube_mean(rollup(cube))
+        avg_temp = global_mean['Avg Temperature (°C)']
+        avg_co2 = global_mean['CO2 Emissions (Tons/Capita)']
+        avg_sea = global_mean['Sea Level Rise (mm)']
+        avg_extreme = global_mean['Extreme Weather Events']
 
     st.markdown("### 🌐 Ringkasan Indikator Global")
 
@@ -70,31 +99,51 @@ def visualisasi():
     # ================= FILTER =================
     st.markdown("### 🌍 Filter Negara")
 
-    country_list = sorted(df['Country'].unique())
+    country_list = sorted(cube['count'].index.unique('Country'))
     country_list.insert(0, "ALL")
 
     selected_country = st.multiselect(
         "Pilih negara untuk dianalisis",
         country_list,
-        default=["ALL"]
+        key=state_key("vis_countries", ["ALL"])
     )
 
     if "ALL" in selected_country or not selected_country:
-        filtered_df = df.copy()
+        filtered_df = df
+        selected_filter = None
     else:
         filtered_df = df[df['Country'].isin(selected_country)]
+        selected_filter = selected_country
+
+    render_key = (version, selection_key(selected_filter))
 
     # ================= LINE CHART =================
     st.markdown("### 📈 Tren Suhu Rata-rata")
 
-    line_temp = alt.Chart(filtered_df).mark_line(point=True).encode(
-        x=alt.X('Year:O', title='Tahun'),
-        y=alt.Y('Avg Temperature (°C):Q', title='Suhu Rata-rata (°C)'),
-        color='Country:N',
-        tooltip=['Country', 'Year', 'Avg Temperature (°C)']
-    ).properties(height=360)
-
-    st.altair_chart(line_temp, use_container_width=True)
+    # Data tren/bar berasal dari cube (ukurannya tidak bergantung jumlah baris)
+    # dan dibatasi CHART_ROW_BUDGET agar tetap di bawah max_rows Altair
+    trend_df, trend_period, trend_truncated = trend_data(cube, 'Avg Temperature (°C)', selected_filter)
+
+    def render_line():
+        return alt.Chart(trend_df).mark_line(point=True).encode(
+            x=alt.X('Year:O', title='Tahun'),
+            y=alt.Y('Avg Temperature (°C):Q', title='Suhu Rata-rata (°C)'),
+            color='Country:N',
+            tooltip=['Country', 'Year', alt.Tooltip('Avg Temperature (°C):Q', format='.1f')]
+        ).properties(height=360).to_json().encode()
+
+    with perf_stage("chart:line"):
+        st.vega_lite_chart(
+            json.loads(cached_render(render_key + ("line",), render_line)),
+            use_container_width=True
+        )
+        if trend_truncated:
+            st.caption(f"Hanya {CHART_ROW_BUDGET:,} negara dengan observasi terbanyak yang ditampilkan.")
+        if trend_period > 1:
+            st.caption(
+                f"Tahun digabung per periode {trend_period} tahun "
+                f"(maksimum {CHART_ROW_BUDGET:,} titik)."
+            )
 
     st.markdown("""
     <div class="interp-box">
@@ -106,16 +155,25 @@ def visualisasi():
     # ================= BAR CHART =================
     st.markdown("### 🏭 Emisi CO₂ Rata-rata per Negara")
 
-    co2_bar = alt.Chart(
-        filtered_df.groupby('Country', as_index=False)['CO2 Emissions (Tons/Capita)'].mean()
-    ).mark_bar().encode(
-        x=alt.X('CO2 Emissions (Tons/Capita):Q', title='CO₂ (Ton/Kapita)'),
-        y=alt.Y('Country:N', sort='-x'),
-        color=alt.Color('CO2 Emissions (Tons/Capita):Q', scale=alt.Scale(scheme='reds')),
-        tooltip=['Country', 'CO2 Emissions (Tons/Capita)']
-    ).properties(height=420)
+    bar_df, bar_truncated = country_mean_data(
+        cube, 'CO2 Emissions (Tons/Capita)', selected_filter
+    )
 
-    st.altair_chart(co2_bar, use_container_width=True)
+    def render_bar():
+        return alt.Chart(bar_df).mark_bar().encode(
+            x=alt.X('CO2 Emissions (Tons/Capita):Q', title='CO₂ (Ton/Kapita)'),
+            y=alt.Y('Country:N', sort='-x'),
+            color=alt.Color('CO2 Emissions (Tons/Capita):Q', scale=alt.Scale(scheme='reds')),
+            tooltip=['Country', 'CO2 Emissions (Tons/Capita)']
+        ).properties(height=420).to_json().encode()
+
+    with perf_stage("chart:bar"):
+        st.vega_lite_chart(
+            json.loads(cached_render(render_key + ("bar",), render_bar)),
+            use_container_width=True
+        )
+        if bar_truncated:
+            st.caption(f"Hanya {CHART_ROW_BUDGET:,} negara dengan emisi tertinggi yang ditampilkan.")
 
     st.markdown("""
     <div class="interp-box">
@@ -124,22 +182,43 @@ def visualisasi():
     </div>
     """, unsafe_allow_html=True)
 
+    # Di atas budget, scatter dan bubble diringkas per bin oleh point_data
+    points_binned = len(filtered_df) > CHART_ROW_BUDGET
+
     # ================= SCATTER =================
     st.markdown("### 🌡️ Hubungan Suhu dan Emisi CO₂")
 
-    scatter = alt.Chart(filtered_df).mark_circle(size=90).encode(
-        x='CO2 Emissions (Tons/Capita):Q',
-        y='Avg Temperature (°C):Q',
-        color=alt.Color('Extreme Weather Events:Q', scale=alt.Scale(scheme='orangered')),
-        tooltip=[
-            'Country',
-            'Avg Temperature (°C)',
+    def render_scatter():
+        scatter_df, scatter_binned = point_data(
+            filtered_df,
             'CO2 Emissions (Tons/Capita)',
-            'Extreme Weather Events'
-        ]
-    ).interactive().properties(height=360)
-
-    st.altair_chart(scatter, use_container_width=True)
+            'Avg Temperature (°C)',
+            values=['Extreme Weather Events'],
+            detail=['Country']
+        )
+
+        return alt.Chart(scatter_df).mark_circle(size=90).encode(
+            x='CO2 Emissions (Tons/Capita):Q',
+            y='Avg Temperature (°C):Q',
+            color=alt.Color('Extreme Weather Events:Q', scale=alt.Scale(scheme='orangered')),
+            tooltip=[
+                COUNT_COLUMN if scatter_binned else 'Country',
+                alt.Tooltip('Avg Temperature (°C):Q', format='.1f'),
+                alt.Tooltip('CO2 Emissions (Tons/Capita):Q', format='.1f'),
+                alt.Tooltip('Extreme Weather Events:Q', format='.1f')
+            ]
+        ).interactive().properties(height=360).to_json().encode()
+
+    with perf_stage("chart:scatter"):
+        st.vega_lite_chart(
+            json.loads(cached_render(render_key + ("scatter",), render_scatter)),
+            use_container_width=True
+        )
+        if points_binned:
+            st.caption(
+                f"{len(filtered_df):,} observasi diringkas menjadi titik rata-rata "
+                f"per bin (maksimum ±{CHART_ROW_BUDGET:,} titik)."
+            )
 
     st.markdown("""
     <div class="interp-box">
@@ -151,20 +230,39 @@ def visualisasi():
     # ================= BUBBLE =================
     st.markdown("### 🌱 Energi Terbarukan dan Emisi CO₂")
 
-    bubble = alt.Chart(filtered_df).mark_circle().encode(
-        x='Renewable Energy (%):Q',
-        y='CO2 Emissions (Tons/Capita):Q',
-        size=alt.Size('Population:Q', scale=alt.Scale(range=[300, 3200])),
-        color='Country:N',
-        tooltip=[
-            'Country',
+    def render_bubble():
+        bubble_df, _ = point_data(
+            filtered_df,
             'Renewable Energy (%)',
             'CO2 Emissions (Tons/Capita)',
-            'Population'
-        ]
-    ).interactive().properties(height=420)
-
-    st.altair_chart(bubble, use_container_width=True)
+            values=['Population'],
+            by='Country'
+        )
+
+        return alt.Chart(bubble_df).mark_circle().encode(
+            x='Renewable Energy (%):Q',
+            y='CO2 Emissions (Tons/Capita):Q',
+            size=alt.Size('Population:Q', scale=alt.Scale(range=[300, 3200])),
+            color='Country:N',
+            tooltip=[
+                'Country',
+                alt.Tooltip('Renewable Energy (%):Q', format='.1f'),
+                alt.Tooltip('CO2 Emissions (Tons/Capita):Q', format='.1f'),
+                alt.Tooltip('Population:Q', format=',.0f'),
+                COUNT_COLUMN
+            ]
+        ).interactive().properties(height=420).to_json().encode()
+
+    with perf_stage("chart:bubble"):
+        st.vega_lite_chart(
+            json.loads(cached_render(render_key + ("bubble",), render_bubble)),
+            use_container_width=True
+        )
+        if points_binned:
+            st.caption(
+                f"{len(filtered_df):,} observasi diringkas menjadi titik rata-rata "
+                f"per negara dan bin (maksimum ±{CHART_ROW_BUDGET:,} titik)."
+            )
 
     st.markdown("""
     <div class="interp-box">
@@ -177,23 +275,20 @@ def visualisasi():
     # ================= HEATMAP =================
     st.markdown("### 🔥 Korelasi Variabel Iklim")
 
-    corr_cols = [
-        'Avg Temperature (°C)',
-        'CO2 Emissions (Tons/Capita)',
-        'Sea Level Rise (mm)',
-        'Rainfall (mm)',
-        'Renewable Energy (%)',
-        'Extreme Weather Events',
-        'Forest Area (%)'
-    ]
+    def render_heatmap():
+        corr = stats_corr(stats, selected_filter)
 
-    corr = filtered_df[corr_cols].corr()
+        fig, ax = plt.subplots(figsize=(9, 6))
+        sns.heatmap(corr, annot=True, cmap='coolwarm', fmt=".2f", ax=ax)
+        ax.set_title("Korelasi Antar Variabel Perubahan Iklim")
 
-    fig, ax = plt.subplots(figsize=(9, 6))
-    sns.heatmap(corr, annot=True, cmap='coolwarm', fmt=".2f", ax=ax)
-    ax.set_title("Korelasi Antar Variabel Perubahan Iklim")
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+        plt.close(fig)
+        return buffer.getvalue()
 
-    st.pyplot(fig)
+    with perf_stage("chart:heatmap"):
+        st.image(cached_render(render_key + ("heatmap",), render_heatmap))
 
     st.markdown("""
     <div class="interp-box">
@@ -202,3 +297,9 @@ def visualisasi():
         bukan sebagai hubungan sebab akibat langsung.
     </div>
     """, unsafe_allow_html=True)
+
+    cache_stats = render_cache_stats()
+    st.caption(
+        f"Cache render grafik: {cache_stats['hits']} hit | {cache_stats['misses']} miss | "
+        f"{cache_stats['entries']} entri ({cache_stats['bytes'] / 2**20:.1f} MB)"
+    )
@@ -0,0 +1,58 @@
+import importlib
+import threading
+import time
+
+from perf import log_event
+
+# ======================================================
+# STARTUP: IMPORT MALAS + WARM-UP LATAR BELAKANG
+# ======================================================
+# "lazy"  : modul halaman (scikit-learn, pandas, altair, matplotlib, ...)
+#           baru diimpor saat halamannya dibuka (default)
+# "warm"  : seperti lazy, lalu setelah render pertama sebuah thread daemon
+#           mengimpor modul halaman agar navigasi berikutnya tidak menunggu
+# "eager" : seluruh modul halaman diimpor sebelum render pertama
+STARTUP_MODES = ("lazy", "warm", "eager")
+WARMUP_MODULES = ("visualisasi", "machine_learning", "prediksi")
+
+_WARMUP_STATE = {"thread": None}
+_WARMUP_LOCK = threading.Lock()
+
+
+def import_page_modules(modules=WARMUP_MODULES):
+    timings = {}
+    for name in modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def _warmup_worker(modules):
+    start = time.perf_counter()
+    try:
+        timings = import_page_modules(modules)
+    except Exception as exc:
+        # Gagal warm-up tidak fatal: halaman tetap mengimpor modulnya sendiri
+        log_event({"event": "warmup_error", "error": repr(exc)})
+        return
+
+    log_event({
+        "event": "warmup",
+        "ms": (time.perf_counter() - start) * 1000,
+        "modules_ms": timings,
+    })
+
+
+def start_background_warmup(modules=WARMUP_MODULES):
+    # Sekali per proses; rerun berikutnya tidak membuat thread baru
+    with _WARMUP_LOCK:
+        if _WARMUP_STATE["thread"] is not None:
+            return False
+        thread = threading.Thread(
+            target=_warmup_worker, args=(modules,), name="dashboard-warmup", daemon=True
+        )
+        _WARMUP_STATE["thread"] = thread
+    thread.start()
+    return True
+